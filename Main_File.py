@@ -1,19 +1,20 @@
+from startup_profile import PROFILE_STARTUP, phase, profiler  # First, so it can time the imports below
 import sys
-import json
-import hashlib
-import subprocess  # This is required to run the external Project.py script
+import time
 from PyQt5.QtWidgets import QApplication, QWidget, QLineEdit, QLabel, QVBoxLayout, QPushButton, QStackedWidget, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
+from passwords import PasswordPool
+from user_store import USER_DB_FILE, open_user_store
+from metrics import observe, timer
 
-# File for storing user data
-USER_DATA_FILE = "users.json"
-
-# Helper function to hash passwords (using SHA-256 for simplicity)
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+# File for storing user data (users.json is imported into it on first run)
+USER_STORE_FILE = USER_DB_FILE
 
 class QuizApp(QWidget):
+    # Emitted from password worker threads; delivered on the GUI thread
+    password_task_done = pyqtSignal(object, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Professional Quiz Application")
@@ -25,27 +26,22 @@ class QuizApp(QWidget):
         self.main_layout.addWidget(self.stacked_widget)
         self.setLayout(self.main_layout)
 
-        # Initialize screens
-        self.init_login_screen()
-        self.init_signup_screen()
-        self.init_welcome_screen()
-        self.init_quiz_screen()
+        # User accounts
+        self.user_store = open_user_store(USER_STORE_FILE)
+        self.current_user = None
 
-        self.stacked_widget.setCurrentWidget(self.login_screen)
+        # Password hashing runs on worker threads so the UI stays responsive
+        self.password_pool = PasswordPool()
+        self.password_task_done.connect(self.on_password_task_done)
 
-    def load_user_data(self):
-        """Load user data from file."""
-        try:
-            with open(USER_DATA_FILE, "r") as file:
-                users = json.load(file)
-                return users
-        except FileNotFoundError:
-            return {}
+        # Initialize screens; the quiz (and its imports) is built on first use
+        with phase("login screens"):
+            self.init_login_screen()
+            self.init_signup_screen()
+            self.init_welcome_screen()
+        self.quiz_screen = None
 
-    def save_user_data(self, users):
-        """Save user data to file."""
-        with open(USER_DATA_FILE, "w") as file:
-            json.dump(users, file)
+        self.stacked_widget.setCurrentWidget(self.login_screen)
 
     def init_login_screen(self):
         """Create and style the login screen."""
@@ -69,9 +65,9 @@ class QuizApp(QWidget):
         self.password_input.setEchoMode(QLineEdit.Password)
 
         # Login button
-        login_button = QPushButton("Login")
-        login_button.setStyleSheet("background-color: #4682b4; color: white; font-size: 14pt; padding: 8px;")
-        login_button.clicked.connect(self.login)
+        self.login_button = QPushButton("Login")
+        self.login_button.setStyleSheet("background-color: #4682b4; color: white; font-size: 14pt; padding: 8px;")
+        self.login_button.clicked.connect(self.login)
 
         # Signup button (navigate to signup screen)
         signup_button = QPushButton("Sign Up")
@@ -84,7 +80,7 @@ class QuizApp(QWidget):
         layout.addWidget(self.username_input)
         layout.addWidget(password_label)
         layout.addWidget(self.password_input)
-        layout.addWidget(login_button)
+        layout.addWidget(self.login_button)
         layout.addWidget(signup_button)
 
         # Add to stacked widget
@@ -117,9 +113,9 @@ class QuizApp(QWidget):
         self.signup_confirm_password_input.setEchoMode(QLineEdit.Password)
 
         # Signup button
-        signup_button = QPushButton("Sign Up")
-        signup_button.setStyleSheet("background-color: #4682b4; color: white; font-size: 14pt; padding: 8px;")
-        signup_button.clicked.connect(self.signup)
+        self.signup_submit_button = QPushButton("Sign Up")
+        self.signup_submit_button.setStyleSheet("background-color: #4682b4; color: white; font-size: 14pt; padding: 8px;")
+        self.signup_submit_button.clicked.connect(self.signup)
 
         # Arrange widgets
         layout.addWidget(title_label)
@@ -129,7 +125,7 @@ class QuizApp(QWidget):
         layout.addWidget(self.signup_password_input)
         layout.addWidget(confirm_password_label)
         layout.addWidget(self.signup_confirm_password_input)
-        layout.addWidget(signup_button)
+        layout.addWidget(self.signup_submit_button)
 
         # Add to stacked widget
         self.stacked_widget.addWidget(self.signup_screen)
@@ -159,23 +155,15 @@ class QuizApp(QWidget):
 
     def init_quiz_screen(self):
         """Create and style the quiz screen."""
+        from Project import QuizApp as QuizScreen  # The quiz runs in this window and process
+
         self.quiz_screen = QWidget()
         layout = QVBoxLayout(self.quiz_screen)
 
-        # Apply background to the entire quiz screen
-        self.quiz_screen.setStyleSheet(
-            "background-image: url('quiz_background.jpg');"
-            "background-repeat: no-repeat;"
-            "background-position: center;"
-            "background-size: cover;"
-        )
-
-        # Add a sample label to the quiz screen to check if it displays
-        label = QLabel("Quiz Questions Will Go Here!")
-        label.setAlignment(Qt.AlignCenter)
-        label.setFont(QFont("Arial", 24, QFont.Bold))
-        label.setStyleSheet("color: white;")
-        layout.addWidget(label)
+        # The quiz from Project.py, sharing this QApplication and its loaded question bank
+        self.quiz_app = QuizScreen()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.quiz_app)
 
         # Ensure the layout is properly set
         self.quiz_screen.setLayout(layout)
@@ -183,36 +171,64 @@ class QuizApp(QWidget):
         # Add to stacked widget
         self.stacked_widget.addWidget(self.quiz_screen)
 
-    def login(self):
-        """Check login credentials and navigate to welcome screen."""
-        username = self.username_input.text()
-        password = self.password_input.text()
+    def run_password_task(self, future, callback):
+        """Call `callback(result)` on the GUI thread once `future` completes."""
+        future.add_done_callback(lambda done: self.password_task_done.emit(done, callback))
 
-        # Load user data from file
-        users = self.load_user_data()
+    def on_password_task_done(self, future, callback):
+        """Deliver a finished password task to its callback."""
+        try:
+            result = future.result()
+        except Exception as e:
+            self.login_button.setEnabled(True)
+            self.signup_submit_button.setEnabled(True)
+            self.show_error(f"Password check failed: {e}")
+            return
+        callback(result)
 
-        # Hash password for comparison
-        hashed_password = hash_password(password)
+    def login(self):
+        """Check login credentials in the background."""
+        # Timed inside rather than with @timed: clicked passes `checked`, which
+        # PyQt only drops for slots whose signature cannot take it
+        with timer("login"):
+            username = self.username_input.text()
+            password = self.password_input.text()
+
+            # Look up the stored hash for this user only
+            stored_hash = self.user_store.get(username)
+
+            # Verify on a worker thread; unknown users are checked against a dummy hash
+            self.login_button.setEnabled(False)
+            started = time.perf_counter()
+            self.run_password_task(self.password_pool.verify(password, stored_hash),
+                                   lambda result: self.finish_login(username, password, result, started))
+
+    def finish_login(self, username, password, result, started):
+        """Navigate to the welcome screen once the password has been verified."""
+        observe("login_verify", time.perf_counter() - started)  # Click to verdict, including the hash check
+        self.login_button.setEnabled(True)
+        matches, needs_rehash = result
 
         # Check if username exists and password matches
-        if username in users and users[username] == hashed_password:
+        if matches:
             print("Login successful!")  # Debug message
-            self.stacked_widget.setCurrentWidget(self.welcome_screen)
-
-            # Execute Project.py after successful login
-            try:
-                subprocess.run(["python", "C:\\Users\\pushh\\OneDrive\\Desktop\\Final_Project\\Project.py"], check=True)  # Run Project.py after login
-                print("Project.py executed successfully!")  # Debug message
-            except subprocess.CalledProcessError as e:
-                self.show_error(f"Failed to run Project.py: {e}")
-            
-            # Once Project.py is done, show the quiz screen
-            self.stacked_widget.setCurrentWidget(self.quiz_screen)
+
+            # Upgrade legacy SHA-256 or outdated-cost hashes in the background
+            if needs_rehash:
+                self.run_password_task(self.password_pool.hash(password),
+                                       lambda new_hash: self.user_store.update(username, new_hash))
+
+            # Go straight to the quiz for this user
+            self.current_user = username
+            self.start_quiz()
         else:
             self.show_error("Invalid login credentials. Please try again.")
 
     def start_quiz(self):
-        """Navigate to the quiz screen."""
+        """Navigate to the quiz screen for the current user."""
+        if self.quiz_screen is None:
+            self.init_quiz_screen()
+        self.quiz_app.set_user(self.current_user)
         self.stacked_widget.setCurrentWidget(self.quiz_screen)
 
     def signup(self):
@@ -226,22 +242,27 @@ class QuizApp(QWidget):
             self.show_error("Passwords do not match. Please try again.")
             return
 
-        # Load existing user data
-        users = self.load_user_data()
-
-        # Check if username already exists
-        if username in users:
+        # Check if username already exists before paying for the hash
+        if username in self.user_store:
             self.show_error("Username already exists. Please choose a different one.")
             return
 
-        # Hash the password before saving
-        hashed_password = hash_password(password)
+        # Hash the password in the background before saving
+        self.signup_submit_button.setEnabled(False)
+        self.run_password_task(self.password_pool.hash(password),
+                               lambda hashed_password: self.finish_signup(username, hashed_password))
+
+    def finish_signup(self, username, hashed_password):
+        """Save the new user once their password has been hashed."""
+        self.signup_submit_button.setEnabled(True)
 
-        # Save the new user data
-        users[username] = hashed_password
-        self.save_user_data(users)
+        # Insert the new user; fails if someone else took the name meanwhile
+        if not self.user_store.add(username, hashed_password):
+            self.show_error("Username already exists. Please choose a different one.")
+            return
 
         # Navigate to the welcome screen after successful signup
+        self.current_user = username
         self.stacked_widget.setCurrentWidget(self.welcome_screen)
 
     def show_signup_screen(self):
@@ -257,7 +278,13 @@ class QuizApp(QWidget):
         msg.exec_()
 
 # Run the application
-app = QApplication(sys.argv)
-window = QuizApp()
-window.show()
-sys.exit(app.exec_())
+if __name__ == "__main__":
+    with phase("QApplication"):
+        app = QApplication(sys.argv)
+    with phase("QuizApp"):
+        window = QuizApp()
+    with phase("show"):
+        window.show()
+    if PROFILE_STARTUP:
+        QTimer.singleShot(0, profiler.report)  # Runs once the event loop is idle
+    sys.exit(app.exec_())
@@ -1,46 +1,50 @@
-import matplotlib.pyplot as plt
-import random
+from startup_profile import PROFILE_STARTUP, phase, profiler  # First, so it can time the imports below
+import math
 import sys
-from quiz_data import quiz_data  # Assuming your quiz data is available here.
+from question_bank import load_quiz_data, category_size, sample_questions
+from charts import render_chart
+from pixmap_cache import set_background
+from quiz_session import QuizSession
+from adaptive import AdaptiveSelector, AdaptiveSession
+from event_log import session_logger, shared_event_log
+from leaderboard import shared_leaderboard
+from metrics import timed
+from ui_ticker import shared_ticker
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QRadioButton,
-    QPushButton, QButtonGroup, QComboBox, QStackedWidget
+    QPushButton, QButtonGroup, QComboBox, QStackedWidget, QCheckBox, QSpinBox
 )
-from PyQt5.QtGui import QFont, QPalette, QBrush, QPixmap
+from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt, QTimer
-import os
+
+# Question database or compiled bank if one has been built, otherwise the quiz_data.py literal
+quiz_data = load_quiz_data()
+QUIZ_LENGTH = 20  # Default number of questions per quiz
 
 class QuizApp(QWidget):
-    def __init__(self):
+    def __init__(self, username=None):
         super().__init__()
         self.setWindowTitle("Professional Quiz Application")
         self.setGeometry(100, 100, 1400, 700)
+        self.username = username
 
         self.stacked_widget = QStackedWidget()
         self.main_layout = QVBoxLayout()
         self.main_layout.addWidget(self.stacked_widget)
         self.setLayout(self.main_layout)
 
-        self.current_question_index = 0
-        self.score = 0
+        # Quiz state and scoring live in the GUI-free session; this widget only drives it
         self.category = ""
-        self.correct_answers = 0
-        self.incorrect_answers = 0
-        self.not_attempted = 0  # Track the number of unanswered questions
-
-        self.points_correct = 4
-        self.points_wrong = -1
-        self.answered_questions = [None] * 5  # Track answered questions
-        self.time_up_questions = [False] * 5  # Track if time is up for a question
-        self.time_remaining_questions = [30] * 5  # Track remaining time for each question
-
-        # Timer Initialization
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_timer)
-
-        self.init_start_screen()
-        self.init_quiz_screen()
-        self.init_end_screen()
+        self.session = None
+
+        # Question clocks are deadlines in the session; one shared ticker refreshes the label
+        self.ticker = shared_ticker()
+
+        # Only the start screen is built up front; the others on first navigation
+        with phase("start screen"):
+            self.init_start_screen()
+        self.quiz_screen = None
+        self.end_screen = None
         self.stacked_widget.setCurrentWidget(self.start_screen)
 
     def init_start_screen(self):
@@ -49,10 +53,11 @@ class QuizApp(QWidget):
 
         self.set_background(self.start_screen, "kbc_background.jpg")
 
-        title_label = QLabel("Welcome to the Quiz App")
-        title_label.setFont(QFont("Arial", 20, QFont.Bold))
-        title_label.setStyleSheet("color: #ffffff;")
-        title_label.setAlignment(Qt.AlignCenter)
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Arial", 20, QFont.Bold))
+        self.title_label.setStyleSheet("color: #ffffff;")
+        self.title_label.setAlignment(Qt.AlignCenter)
+        self.set_user(self.username)
 
         category_label = QLabel("Select a category:")
         category_label.setFont(QFont("Arial", 14, QFont.Bold))
@@ -62,14 +67,27 @@ class QuizApp(QWidget):
         self.category_dropdown = QComboBox()
         self.category_dropdown.addItems(quiz_data.keys())
         self.category_dropdown.setStyleSheet("font-size: 12pt; padding: 5px;")
+        self.category_dropdown.currentTextChanged.connect(self.update_length_limit)
+
+        self.length_spinbox = QSpinBox()
+        self.length_spinbox.setPrefix("Questions: ")
+        self.length_spinbox.setStyleSheet("font-size: 12pt; padding: 5px;")
+        self.update_length_limit(self.category_dropdown.currentText())
+        self.length_spinbox.setValue(QUIZ_LENGTH)
+
+        # Adaptive mode picks each question to match how well the user is doing
+        self.adaptive_checkbox = QCheckBox("Adaptive difficulty")
+        self.adaptive_checkbox.setStyleSheet("color: #ffffff; font-size: 12pt; padding: 5px;")
 
         start_button = QPushButton("Start Quiz")
         start_button.setStyleSheet("background-color: #4682b4; color: white; font-size: 14pt; padding: 8px;")
         start_button.clicked.connect(self.start_quiz)
 
-        layout.addWidget(title_label, alignment=Qt.AlignCenter)
+        layout.addWidget(self.title_label, alignment=Qt.AlignCenter)
         layout.addWidget(category_label, alignment=Qt.AlignCenter)
         layout.addWidget(self.category_dropdown, alignment=Qt.AlignCenter)
+        layout.addWidget(self.length_spinbox, alignment=Qt.AlignCenter)
+        layout.addWidget(self.adaptive_checkbox, alignment=Qt.AlignCenter)
         layout.addWidget(start_button, alignment=Qt.AlignCenter)
         self.stacked_widget.addWidget(self.start_screen)
 
@@ -91,7 +109,7 @@ class QuizApp(QWidget):
             radio_button = QRadioButton(self)
             radio_button.setStyleSheet("font-size: 12pt; padding: 5px;")
             self.radio_buttons.append(radio_button)
-            self.button_group.addButton(radio_button)
+            self.button_group.addButton(radio_button, i)  # The button id is the option index
             layout.addWidget(radio_button)
 
         # Timer Label (added to quiz screen)
@@ -143,30 +161,69 @@ class QuizApp(QWidget):
         layout.addWidget(restart_button, alignment=Qt.AlignCenter)
         self.stacked_widget.addWidget(self.end_screen)
 
+    def ensure_quiz_screen(self):
+        """Build the quiz screen the first time it is shown."""
+        if self.quiz_screen is None:
+            with phase("quiz screen"):
+                self.init_quiz_screen()
+        return self.quiz_screen
+
+    def ensure_end_screen(self):
+        """Build the end screen the first time it is shown."""
+        if self.end_screen is None:
+            with phase("end screen"):
+                self.init_end_screen()
+        return self.end_screen
+
+    def update_length_limit(self, category):
+        """Let the quiz length go up to the size of the selected category."""
+        if category:
+            self.length_spinbox.setRange(1, max(1, category_size(quiz_data, category)))
+
+    def set_user(self, username):
+        """Set the logged-in user when the quiz is embedded after a login."""
+        self.username = username
+        if username:
+            self.title_label.setText(f"Welcome to the Quiz App, {username}")
+        else:
+            self.title_label.setText("Welcome to the Quiz App")
+
+    @timed("set_background")
     def set_background(self, widget, image_path):
-        """Set background for a given widget."""
-        palette = QPalette()
-        palette.setBrush(QPalette.Background, QBrush(QPixmap(image_path).scaled(1400, 700, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)))
-        widget.setAutoFillBackground(True)
-        widget.setPalette(palette)
+        """Set background for a given widget, shared through the pixmap cache and rescaled on resize."""
+        set_background(widget, image_path)
 
     def start_quiz(self):
         self.category = self.category_dropdown.currentText()
-        self.questions = random.sample(quiz_data[self.category], len(quiz_data[self.category]))
-        self.current_question_index = 0
-        self.score = 0
-        self.correct_answers = 0
-        self.incorrect_answers = 0
-        self.not_attempted = 0  # Reset not attempted counter
-        self.answered_questions = [None] * len(self.questions)
-        self.time_up_questions = [False] * len(self.questions)  # Reset time-up tracking
-        self.time_remaining_questions = [30] * len(self.questions)  # Reset remaining time
-
-        self.stacked_widget.setCurrentWidget(self.quiz_screen)
-        self.load_question()
+        length = min(self.length_spinbox.value(), category_size(quiz_data, self.category))
+        if self.adaptive_checkbox.isChecked():
+            self.session = AdaptiveSession(AdaptiveSelector(quiz_data, self.category), length, self.category)
+        else:
+            self.session = QuizSession(sample_questions(quiz_data, self.category, length), self.category)
+        event_log = shared_event_log()
+        if event_log is not None:
+            self.session.listener = session_logger(event_log, user=self.username)
+        self.session.start_clock()
+
+        self.stacked_widget.setCurrentWidget(self.ensure_quiz_screen())
+        self.show_current_question()
+
+    def show_current_question(self):
+        """Show the session's current question, or the score once it has finished."""
+        if self.session.finished:
+            self.ticker.unsubscribe(self.update_timer)  # Stop the timer when the quiz ends
+            self.show_score()
+        else:
+            self.load_question()
+
+    def selected_option(self):
+        """Return the index of the checked option, or None."""
+        option = self.button_group.checkedId()
+        return option if option >= 0 else None
 
+    @timed("load_question")
     def load_question(self):
-        question_data = self.questions[self.current_question_index]
+        question_data = self.session.current
         self.question_label.setText(question_data["question"])
 
         # Reset radio button selection for every new question
@@ -179,98 +236,79 @@ class QuizApp(QWidget):
             self.radio_buttons[i].setText(option)
 
         # If the time for this question has expired, show "Time Over"
-        if self.time_up_questions[self.current_question_index]:
+        if self.session.is_time_up():
             self.timer_label.setText("Time Over")
             for radio_button in self.radio_buttons:
                 radio_button.setDisabled(True)  # Disable interaction for this question
-            self.timer.stop()  # Ensure timer doesn't restart
+            self.ticker.unsubscribe(self.update_timer)  # Ensure timer doesn't restart
         else:
-            self.time_remaining = self.time_remaining_questions[self.current_question_index]  # Use stored time
-            self.timer_label.setText(f"Time Left: {self.time_remaining}s")
-            self.timer.start(1000)  # Start the timer for this question
+            self.timer_label.setText(f"Time Left: {math.ceil(self.session.time_left())}s")
+            self.ticker.subscribe(self.update_timer)  # Refresh the countdown for this question
 
+    @timed("update_timer")
     def update_timer(self):
-        """Update the timer and handle time out."""
-        if self.time_remaining > 0:
-            self.time_remaining -= 1
-            self.timer_label.setText(f"Time Left: {self.time_remaining}s")
-            self.time_remaining_questions[self.current_question_index] = self.time_remaining  # Update remaining time
+        """Refresh the countdown from the question's deadline and handle time out."""
+        if not self.session.expired():
+            self.timer_label.setText(f"Time Left: {math.ceil(self.session.time_left())}s")
         else:
             self.timer_label.setText("Time Over")
-            self.time_up_questions[self.current_question_index] = True  # Mark question as time-up
-            self.next_question()  # Automatically move to the next question
+            self.session.timeout(self.selected_option())  # Automatically move to the next question
+            self.show_current_question()
 
     def next_question(self):
-        selected_button = self.button_group.checkedButton()
-        if selected_button:
-            selected_answer = selected_button.text()
-            correct_answer = self.questions[self.current_question_index]["answer"]
-
-            if self.answered_questions[self.current_question_index] is None:
-                if selected_answer == correct_answer:
-                    self.score += self.points_correct
-                    self.correct_answers += 1
-                else:
-                    self.score += self.points_wrong
-                    self.incorrect_answers += 1
-                self.answered_questions[self.current_question_index] = selected_answer
-            else:
-                self.not_attempted += 1  # Count unanswered questions as not attempted
-
-        self.current_question_index += 1
-        if self.current_question_index < len(self.questions):
-            self.load_question()
-        else:
-            self.timer.stop()  # Stop the timer when the quiz ends
-            self.show_score()
+        self.session.answer(self.selected_option())
+        self.show_current_question()
 
     def skip_question(self):
         """Skip the current question and mark it as 'Not Attempted'."""
-        self.not_attempted += 1  # Mark the question as not attempted
-        self.current_question_index += 1  # Move to the next question
-        if self.current_question_index < len(self.questions):
-            self.load_question()
-        else:
-            self.show_score()
+        self.session.skip()
+        self.show_current_question()
 
     def previous_question(self):
-        if self.current_question_index > 0:
-            self.current_question_index -= 1
+        if self.session.index > 0:
+            self.session.previous()
             self.load_question()
 
     def show_score(self):
-        self.score_label.setText(f"Your score: {self.score}\n"
-                                 f"Correct answers: {self.correct_answers}\n"
-                                 f"Incorrect answers: {self.incorrect_answers}\n"
-                                 f"Not attempted: {self.not_attempted}")
+        end_screen = self.ensure_end_screen()
+        score, correct, incorrect, not_attempted = self.session.results()
+        text = (f"Your score: {score}\n"
+                f"Correct answers: {correct}\n"
+                f"Incorrect answers: {incorrect}\n"
+                f"Not attempted: {not_attempted}")
+        if self.username:
+            leaderboard = shared_leaderboard()
+            leaderboard.record(self.category, self.username, score)
+            board = leaderboard.board(self.category)
+            text += f"\nRank in {self.category}: #{board.rank(self.username)} of {len(board)}"
+        self.score_label.setText(text)
         self.display_pie_chart()
-        self.stacked_widget.setCurrentWidget(self.end_screen)
+        self.stacked_widget.setCurrentWidget(end_screen)
 
+    @timed("display_pie_chart")
     def display_pie_chart(self):
-        labels = ['Correct', 'Incorrect', 'Not Attempted']
-        sizes = [self.correct_answers, self.incorrect_answers, self.not_attempted]
-        colors = ['#0000FF', '#FF0000', '#808080']  # Blue for correct, Red for incorrect, Grey for not attempted
-        explode = (0.1, 0, 0)  # Highlight correct answers
-
-        plt.figure(figsize=(4, 4))
-        plt.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', startangle=140)
-        plt.axis('equal')
-
-        pie_chart_file = 'pie_chart.png'
-        plt.savefig(pie_chart_file)
-        plt.close()
+        sizes = self.session.results()[1:]
+        if not any(sizes):
+            self.pie_chart_label.clear()  # Nothing to chart
+            return
 
-        pixmap = QPixmap(pie_chart_file)
-        self.pie_chart_label.setPixmap(pixmap)
-        os.remove(pie_chart_file)  # Remove the temporary file after displaying
+        # Rendered in memory by the configured chart backend and cached per result
+        image = render_chart(sizes)
+        self.pie_chart_label.setPixmap(QPixmap.fromImage(image))
 
     def restart_quiz(self):
+        self.ticker.unsubscribe(self.update_timer)
         self.stacked_widget.setCurrentWidget(self.start_screen)
 
 
 # Main loop to start the application
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = QuizApp()
-    window.show()
+    with phase("QApplication"):
+        app = QApplication(sys.argv)
+    with phase("QuizApp"):
+        window = QuizApp()
+    with phase("show"):
+        window.show()
+    if PROFILE_STARTUP:
+        QTimer.singleShot(0, profiler.report)  # Runs once the event loop is idle
     sys.exit(app.exec_())
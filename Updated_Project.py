@@ -1,5 +1,5 @@
 import sys
-from quiz_data import quiz_data
+from question_bank import load_quiz_data
 import random
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QRadioButton,
@@ -9,6 +9,7 @@ from PyQt5.QtGui import QFont, QPalette, QBrush, QPixmap
 from PyQt5.QtCore import Qt
 
 # Define the updated quiz data with more questions and multiple categories
+quiz_data = load_quiz_data()
 
 
 class QuizApp(QWidget):
@@ -104,7 +105,7 @@ class QuizApp(QWidget):
             radio_button = QRadioButton(self)
             radio_button.setStyleSheet("font-size: 12pt; padding: 5px;")
             self.radio_buttons.append(radio_button)
-            self.button_group.addButton(radio_button)
+            self.button_group.addButton(radio_button, i)  # The button id is the option index
             layout.addWidget(radio_button)
 
         # Navigation buttons: Next, Skip, Previous
@@ -189,9 +190,8 @@ def load_question(self):
         self.radio_buttons[i].setChecked(False)
     def next_question(self):
         """Check the answer, load the next question, or finish the quiz."""
-        selected_button = self.button_group.checkedButton()
-        if selected_button:
-            selected_answer = selected_button.text()
+        selected_answer = self.button_group.checkedId()
+        if selected_answer >= 0:
             correct_answer = self.questions[self.current_question_index]["answer"]
             
             if self.answered_questions[self.current_question_index] is None:
@@ -0,0 +1,131 @@
+import math
+import random
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from quiz_session import QuizSession
+
+TARGET_P = 0.7  # Chance of a correct answer the next question is aimed at
+K_FACTOR = 0.4  # Elo step size, in logits per unexpected answer
+WINDOW = 0.25  # Half-width of the difficulty window first searched around the target
+
+
+def difficulty_order(bank, category):
+    """Return (keys, difficulties) of a category's questions in ascending difficulty.
+
+    A key is what `fetch_question` needs to load the question again: the
+    question id for a QuestionStore, the position in the category otherwise.
+    QuestionStore and QuestionBank keep the order with the bank, so only
+    in-memory banks, whose records are already loaded, are sorted here.
+    """
+    if hasattr(bank, "difficulties"):
+        return bank.difficulties(category)
+    levels = [question.get("difficulty", 0.0) for question in bank[category]]
+    positions = sorted(range(len(levels)), key=levels.__getitem__)
+    return array("q", positions), array("d", [levels[i] for i in positions])
+
+
+def fetch_question(bank, category, key):
+    if hasattr(bank, "question"):
+        return bank.question(key)
+    return bank[category][key]
+
+
+class AdaptiveSelector:
+    """Pick questions near a running Elo/Rasch ability estimate.
+
+    The examinee's ability and each question's difficulty share a logit
+    scale: the chance of a correct answer is sigmoid(ability - difficulty).
+    The next question is drawn uniformly from the unasked questions whose
+    difficulty lies in a window around the level with a TARGET_P chance of
+    success, widening the window while it is empty. Only the positions of
+    the asked questions in the difficulty order are kept, in a sorted list,
+    so a session holds O(k) state for k questions asked and each pick costs
+    O(log n + k) however large the category.
+    """
+
+    def __init__(self, bank, category, ability=0.0, k_factor=K_FACTOR, target_p=TARGET_P, rng=random):
+        self.bank = bank
+        self.category = category
+        self.keys, self.difficulties = difficulty_order(bank, category)
+        self.asked = []  # Sorted positions of the questions asked so far
+        self.remaining = len(self.keys)
+        self.ability = ability
+        self.k_factor = k_factor
+        self.offset = math.log(target_p / (1 - target_p))
+        self.rng = rng
+
+    def __len__(self):
+        return self.remaining
+
+    def target(self):
+        """The difficulty the next question is aimed at."""
+        return self.ability - self.offset
+
+    def next(self):
+        """Draw the next unasked question, or raise IndexError when none are left."""
+        if not self.remaining:
+            raise IndexError("every question of the category has been asked")
+        target = self.target()
+        width = WINDOW
+        while True:
+            low = bisect_left(self.difficulties, target - width)
+            high = bisect_right(self.difficulties, target + width)
+            start = bisect_left(self.asked, low)
+            free = high - low - (bisect_left(self.asked, high) - start)
+            if free:
+                break
+            width *= 2
+        # Step the free-th unasked position past each asked one at or before it
+        position = low + self.rng.randrange(free)
+        for asked in self.asked[start:]:
+            if asked > position:
+                break
+            position += 1
+        insort(self.asked, position)
+        self.remaining -= 1
+        question = fetch_question(self.bank, self.category, self.keys[position])
+        if "difficulty" not in question:
+            question = dict(question, difficulty=self.difficulties[position])
+        return question
+
+    def expected(self, question):
+        """Chance of answering `question` correctly at the current ability."""
+        return 1 / (1 + math.exp(question["difficulty"] - self.ability))
+
+    def record(self, question, correct):
+        """Move the ability estimate after an answer."""
+        self.ability += self.k_factor * ((1.0 if correct else 0.0) - self.expected(question))
+
+
+class AdaptiveSession(QuizSession):
+    """A QuizSession whose questions are chosen one at a time by an AdaptiveSelector.
+
+    The next question is picked when the examinee moves past the last one
+    shown, so it reflects every answer given so far. Going back shows the
+    questions already picked.
+    """
+
+    __slots__ = ("selector",)
+
+    def __init__(self, selector, length, category="", **kwargs):
+        super().__init__([None] * min(length, len(selector)), category, **kwargs)
+        self.selector = selector
+        if self.questions:
+            self.questions[0] = selector.next()
+
+    @property
+    def ability(self):
+        return self.selector.ability
+
+    def _grade(self, selected):
+        ok = super()._grade(selected)
+        if ok is not None:
+            self.selector.record(self.current, ok)
+        return ok
+
+    def _advance(self):
+        following = self.index + 1
+        if following < len(self.questions) and self.questions[following] is None:
+            self.questions[following] = self.selector.next()
+        return super()._advance()
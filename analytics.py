@@ -0,0 +1,203 @@
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from event_log import EVENT_LOG
+from question_bank import DIFFICULTY_FILE, BankWriter, QuestionBank, load_difficulties, load_quiz_data
+from quiz_session import QUESTION_TIME
+
+CHUNK_BYTES = 16 * 2 ** 20  # Size of the slice of the log each task aggregates
+MIN_RESPONSES = 20  # Graded answers needed before a question's difficulty is re-estimated
+
+# Per-question counters, kept as a flat list so partial results pickle cheaply:
+#   graded, correct, skips, timeouts, seconds used by graded answers (sum), graded answers with a time,
+#   then one count per option
+GRADED, CORRECT, SKIPS, TIMEOUTS, SECONDS, TIMED, OPTION_COUNTS = range(7)
+OPTIONS = 6  # Options counted per question at most
+
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """Split a log into byte ranges; each line belongs to the range its first byte falls in."""
+    size = os.path.getsize(path)
+    return [(path, start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+
+def aggregate_range(task, question_time=QUESTION_TIME):
+    """Map step: count the events whose lines start in [start, end) of the log."""
+    path, start, end = task
+    stats = {}
+    with open(path, "rb") as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()  # Finish the line that started in the previous range
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Torn by a crash
+            kind = event.get("event")
+            if kind not in ("answer", "skip", "timeout") or event.get("qid") is None:
+                continue
+            key = (event["category"], event["qid"])
+            counters = stats.get(key)
+            if counters is None:
+                counters = stats[key] = [0, 0, 0, 0, 0.0, 0] + [0] * OPTIONS
+            if kind == "skip":
+                counters[SKIPS] += 1
+                continue
+            if kind == "timeout":
+                counters[TIMEOUTS] += 1
+            option = event.get("option")
+            if event.get("ok") is not None:
+                counters[GRADED] += 1
+                counters[CORRECT] += event["ok"]
+                if option is not None and 0 <= option < OPTIONS:
+                    counters[OPTION_COUNTS + option] += 1
+                # Only graded answers count: an ungraded one (a re-answer after going back, or an
+                # answer to a question whose time ran out) would count the question's time again
+                if event.get("remaining") is not None:
+                    counters[SECONDS] += question_time - event["remaining"]
+                    counters[TIMED] += 1
+    return stats
+
+
+def merge(total, partial):
+    """Reduce step: add one range's counters into the running total."""
+    for key, counters in partial.items():
+        current = total.get(key)
+        if current is None:
+            total[key] = counters
+        else:
+            for i, value in enumerate(counters):
+                current[i] += value
+    return total
+
+
+def aggregate(path=EVENT_LOG, workers=None, chunk_bytes=CHUNK_BYTES):
+    """Aggregate a whole log over a process pool; return {(category, qid): counters}."""
+    tasks = chunk_ranges(path, chunk_bytes)
+    total = {}
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            merge(total, aggregate_range(task))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Each worker returns counters for its range only, so what crosses between processes
+        # is proportional to the number of questions, not the number of events
+        for partial in executor.map(aggregate_range, tasks):
+            merge(total, partial)
+    return total
+
+
+def difficulty(correct, graded):
+    """Rasch difficulty on the logit scale the adaptive mode uses, from a smoothed p-value."""
+    p = (correct + 0.5) / (graded + 1)
+    return math.log((1 - p) / p)
+
+
+def question_report(counters, min_responses=MIN_RESPONSES):
+    graded = counters[GRADED]
+    decisions = graded + counters[SKIPS] + counters[TIMEOUTS]
+    options = counters[OPTION_COUNTS:]
+    report = {
+        "responses": graded,
+        "p_value": counters[CORRECT] / graded if graded else None,
+        "avg_seconds": counters[SECONDS] / counters[TIMED] if counters[TIMED] else None,
+        "skip_rate": counters[SKIPS] / decisions if decisions else None,
+        "timeout_rate": counters[TIMEOUTS] / decisions if decisions else None,
+        "option_share": [count / graded for count in options] if graded else None,
+    }
+    if graded >= min_responses:
+        # Too few answers give a noisy estimate, so those questions keep their current difficulty
+        report["difficulty"] = difficulty(counters[CORRECT], graded)
+    return report
+
+
+def build_report(stats, min_responses=MIN_RESPONSES):
+    """Return {category: {qid: question report}}."""
+    report = {}
+    for (category, qid), counters in stats.items():
+        report.setdefault(category, {})[qid] = question_report(counters, min_responses)
+    return report
+
+
+def apply_difficulties(report, bank):
+    """Write re-estimated difficulties back to the bank.
+
+    A QuestionStore is updated in place. Otherwise the estimates are merged
+    into DIFFICULTY_FILE, which load_quiz_data applies to the built-in bank
+    and question_bank.py applies when compiling; a compiled bank is also
+    rewritten with them, which closes it.
+    """
+    updates = {(category, qid): question["difficulty"] for category, questions in report.items()
+               for qid, question in questions.items() if "difficulty" in question}
+    if hasattr(bank, "update_difficulties"):
+        bank.update_difficulties((qid, value) for (_, qid), value in updates.items())
+        return len(updates)
+    saved = load_difficulties()
+    for (category, qid), value in updates.items():
+        saved.setdefault(category, {})[qid] = value
+    with open(DIFFICULTY_FILE + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(saved, file, ensure_ascii=False, indent=1)
+    os.replace(DIFFICULTY_FILE + ".tmp", DIFFICULTY_FILE)
+    if isinstance(bank, QuestionBank):
+        writer = BankWriter(bank.path)
+        for category in bank:
+            levels = saved.get(category, {})
+            writer.add_questions(category, (dict(question, difficulty=levels[question["qid"]])
+                                            if question["qid"] in levels else question
+                                            for question in bank[category]))
+        bank.close()  # Before the new file replaces the mapped one
+        writer.close()
+    return len(updates)
+
+
+def print_report(report, out=sys.stdout, hardest=5):
+    for category, questions in report.items():
+        graded = [q for q in questions.values() if q["p_value"] is not None]
+        responses = sum(q["responses"] for q in graded)
+        correct = sum(q["p_value"] * q["responses"] for q in graded)
+        print(f"{category}: {len(questions)} questions seen, {responses} graded answers, "
+              f"{correct / responses if responses else 0:.1%} correct", file=out)
+        ranked = sorted(((q["p_value"], qid) for qid, q in questions.items() if q["p_value"] is not None))
+        for p_value, qid in ranked[:hardest]:
+            question = questions[qid]
+            shares = question["option_share"]
+            while len(shares) > 2 and not shares[-1]:
+                shares = shares[:-1]  # Questions have fewer options than OPTIONS
+            shares = " ".join(f"{share:.0%}" for share in shares)
+            seconds = question["avg_seconds"]
+            used = f"{seconds:.1f}s" if seconds is not None else "-"
+            print(f"  #{qid}: p={p_value:.2f}  skip {question['skip_rate']:.0%}  {used} used  "
+                  f"options {shares}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-question statistics from the quiz event log.")
+    parser.add_argument("log", nargs="?", default=EVENT_LOG)
+    parser.add_argument("--workers", type=int, help="processes (default: one per core)")
+    parser.add_argument("--output", help="write the full per-question report as JSON")
+    parser.add_argument("--update-difficulty", action="store_true",
+                        help="store re-estimated difficulties in quiz_data.db, or in question_difficulty.json "
+                             "and any compiled quiz_data.qbank")
+    parser.add_argument("--min-responses", type=int, default=MIN_RESPONSES)
+    args = parser.parse_args()
+
+    report = build_report(aggregate(args.log, args.workers), args.min_responses)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=1)
+    if args.update_difficulty:
+        updated = apply_difficulties(report, load_quiz_data())
+        print(f"Updated the difficulty of {updated} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from analytics import aggregate, build_report
+from quiz_session import QUESTION_TIME
+
+CATEGORIES = ["Synthetic 1", "Synthetic 2", "Synthetic 3", "Synthetic 4"]
+
+
+def write_log(path, events, questions, seed):
+    """Write a log of answer, skip and timeout events over `questions` per category."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        lines = []
+        for number in range(events):
+            qid = rng.randrange(questions)
+            roll = rng.random()
+            kind = "skip" if roll < 0.05 else "timeout" if roll < 0.08 else "answer"
+            option = None if kind == "skip" else rng.randrange(4)
+            lines.append(json.dumps(
+                {"ts": 1.7e9 + number, "session": f"s{number // 20}", "user": f"user{number % 5000}",
+                 "category": CATEGORIES[qid % len(CATEGORIES)], "qid": qid, "index": number % 20,
+                 "event": kind, "option": option, "ok": None if option is None else option == qid % 4,
+                 "remaining": 0.0 if kind == "timeout" else round(rng.uniform(0, QUESTION_TIME), 2)},
+                separators=(",", ":")) + "\n")
+            if len(lines) == 100_000:
+                file.writelines(lines)
+                lines.clear()
+        file.writelines(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics throughput over a synthetic event log.")
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-mb", type=float, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        write_log(path, args.events, args.questions, args.seed)
+        size = os.path.getsize(path) / 2 ** 20
+        print(f"{args.events:,} events, {size:.0f} MB, {os.cpu_count()} cores")
+
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            stats = aggregate(path, workers, int(args.chunk_mb * 2 ** 20))
+            report = build_report(stats)
+            elapsed = time.perf_counter() - started
+            if baseline is None:
+                baseline = elapsed
+                expected = stats
+            assert stats == expected, "parallel aggregation differs from the first run"
+            print(f"{workers} workers: {elapsed:.2f}s ({args.events / elapsed:,.0f} events/s, "
+                  f"x{baseline / elapsed:.2f}), {sum(len(q) for q in report.values()):,} questions")
+
+
+if __name__ == "__main__":
+    main()
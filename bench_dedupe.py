@@ -0,0 +1,82 @@
+import argparse
+import random
+import resource
+import time
+
+from dedupe import THRESHOLD, Deduplicator
+from question_bank import normalize_question
+from synthetic import WORDS, iter_questions
+
+CATEGORIES = ("Science", "History", "Literature", "Geography")
+
+
+def make_bank_with_duplicates(size, duplicate_rate, seed):
+    """Return (bank, planted pairs): a synthetic bank where some questions are lightly edited copies.
+
+    A copy changes one word of the question and is filed under a random
+    category, so some copies are within-category duplicates and some look
+    miscategorized.
+    """
+    rng = random.Random(seed)
+    bank = {category: [] for category in CATEGORIES}
+    originals = []
+    for category, question in iter_questions(size, CATEGORIES, seed):
+        bank[category].append(normalize_question(question, len(bank[category])))
+        originals.append((category, len(bank[category]) - 1))
+
+    planted = []
+    for category, qid in rng.sample(originals, int(size * duplicate_rate)):
+        question = dict(bank[category][qid])
+        words = question["question"].split()
+        words[rng.randrange(1, len(words))] = rng.choice(WORDS)
+        question["question"] = " ".join(words)
+        target = rng.choice(CATEGORIES)
+        question["qid"] = len(bank[target])
+        bank[target].append(question)
+        planted.append(((category, qid), (target, question["qid"])))
+    return bank, planted
+
+
+def run(size, duplicate_rate, threshold, seed):
+    bank, planted = make_bank_with_duplicates(size, duplicate_rate, seed)
+    deduplicator = Deduplicator(threshold=threshold)
+
+    started = time.perf_counter()
+    for category, questions in bank.items():
+        deduplicator.add_questions(category, questions)
+    deduplicator.signatures()
+    signed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pairs = deduplicator.duplicates()
+    matched = time.perf_counter() - started
+
+    found = {frozenset((deduplicator.keys[i], deduplicator.keys[j])) for i, j, _ in pairs}
+    expected = {frozenset(pair) for pair in planted}
+    recall = len(found & expected) / len(expected) if expected else 1.0
+    return {"questions": len(deduplicator.keys), "sign_s": signed, "match_s": matched,
+            "pairs": len(found), "planted": len(expected), "recall": recall,
+            "unexpected": len(found - expected)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash/LSH deduplication on synthetic banks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--duplicates", type=float, default=0.01, help="fraction of questions copied with an edit")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10}{'sign s':>9}{'match s':>9}{'q/s':>11}{'pairs':>8}{'planted':>9}"
+          f"{'recall':>8}{'unexpected':>12}{'max RSS MB':>12}")
+    for size in args.sizes:
+        result = run(size, args.duplicates, args.threshold, args.seed)
+        total = result["sign_s"] + result["match_s"]
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{result['questions']:>10,}{result['sign_s']:>9.2f}{result['match_s']:>9.2f}"
+              f"{result['questions'] / total:>11,.0f}{result['pairs']:>8,}{result['planted']:>9,}"
+              f"{result['recall']:>8.3f}{result['unexpected']:>12,}{rss:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
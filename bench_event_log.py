@@ -0,0 +1,63 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from bench_session import percentiles
+from event_log import COMMIT_INTERVAL, EventLog, read_events
+
+
+def event(number):
+    return {"ts": time.time(), "session": "bench", "user": "bench", "category": "Synthetic",
+            "qid": number, "index": number % 20, "event": "answer", "option": number % 4,
+            "ok": number % 3 == 0, "remaining": 12.5}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event log append latency and sustained group-commit throughput.")
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--producers", type=int, default=4, help="threads appending at once")
+    parser.add_argument("--commit-interval", type=float, default=COMMIT_INTERVAL)
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        log = EventLog(path, args.commit_interval, fsync=not args.no_fsync)
+        latencies = [[] for _ in range(args.producers)]
+        per_producer = args.events // args.producers
+
+        def produce(samples, offset):
+            clock = time.perf_counter_ns
+            for number in range(offset, offset + per_producer):
+                record = event(number)
+                started = clock()
+                log.append(record)
+                samples.append(clock() - started)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=produce, args=(latencies[i], i * per_producer))
+                   for i in range(args.producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        appended = time.perf_counter() - started
+        log.flush()
+        durable = time.perf_counter() - started
+        log.close()
+
+        stats = percentiles([sample for samples in latencies for sample in samples])
+        total = per_producer * args.producers
+        assert sum(1 for _ in read_events(path)) == total
+        print(f"append on caller thread: p50 {stats['p50_us']:.2f} us  p99 {stats['p99_us']:.2f} us  "
+              f"max {stats['max_us']:.0f} us")
+        print(f"{total:,} events from {args.producers} threads durable in {durable:.2f}s "
+              f"({total / durable:,.0f} events/s; appends took {appended:.2f}s)")
+        print(f"{log.batches:,} group commits, {total / max(log.batches, 1):,.0f} events per fsync, "
+              f"{os.path.getsize(path) / total:.0f} bytes per event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bench_session import percentiles
+from leaderboard import Leaderboard
+
+CATEGORY = "Synthetic"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard record, rank, top-K, commit and load costs.")
+    parser.add_argument("--attempts", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    users = [f"user{i}" for i in range(args.users)]
+    with tempfile.TemporaryDirectory() as directory:
+        leaderboard = Leaderboard(os.path.join(directory, "leaderboard.db"), legacy_file=None)
+        scores = [max(-20, min(80, int(rng.gauss(30, 15)))) for _ in range(args.attempts)]
+        started = time.perf_counter()
+        for score in scores:
+            leaderboard.record(CATEGORY, rng.choice(users), score)
+        elapsed = time.perf_counter() - started
+        leaderboard.flush()
+        committed = time.perf_counter() - started
+        board = leaderboard.board(CATEGORY)
+        print(f"record: {args.attempts:,} attempts by {len(board):,} players in {elapsed:.1f}s "
+              f"({elapsed / args.attempts * 1e6:.2f} us each on the caller, including the random draw); "
+              f"all committed after {committed:.1f}s")
+
+        clock = time.perf_counter_ns
+        for label, query in (("rank", lambda: board.rank(rng.choice(users))),
+                             ("top 100", lambda: board.top(100))):
+            samples = []
+            for _ in range(args.queries):
+                started = clock()
+                query()
+                samples.append(clock() - started)
+            stats = percentiles(samples)
+            print(f"{label}: p50 {stats['p50_us']:.1f} us  p99 {stats['p99_us']:.1f} us")
+
+        leaderboard.close()
+        started = time.perf_counter()
+        reopened = Leaderboard(leaderboard.path, legacy_file=None)
+        reopened.board(CATEGORY)
+        loaded = time.perf_counter() - started
+        reopened.close()
+        print(f"load: {loaded:.2f}s for the category, {os.path.getsize(leaderboard.path) / 2 ** 20:.0f} MB database")
+
+
+if __name__ == "__main__":
+    main()
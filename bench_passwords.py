@@ -0,0 +1,45 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passwords import PasswordHasher
+
+# Cost settings to compare; the first scrypt row is the default
+SETTINGS = [
+    ("scrypt", {"n": 2 ** 14, "r": 8, "p": 1}),
+    ("scrypt", {"n": 2 ** 15, "r": 8, "p": 1}),
+    ("scrypt", {"n": 2 ** 16, "r": 8, "p": 1}),
+    ("pbkdf2_sha256", {"iterations": 200_000}),
+    ("pbkdf2_sha256", {"iterations": 600_000}),
+    ("pbkdf2_sha256", {"iterations": 1_200_000}),
+]
+
+
+def measure(hasher, duration, workers):
+    """Return hashes per second over roughly `duration` seconds."""
+    count = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while time.perf_counter() - started < duration:
+            list(executor.map(hasher.hash, ["correct horse battery staple"] * workers))
+            count += workers
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing throughput per cost setting.")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per measurement")
+    parser.add_argument("--workers", type=int, default=4, help="threads for the pooled measurement")
+    args = parser.parse_args()
+
+    print(f"{'scheme':<15}{'parameters':<28}{'hash/s (1)':>12}{f'hash/s ({args.workers})':>14}{'ms/hash':>10}")
+    for scheme, params in SETTINGS:
+        hasher = PasswordHasher(scheme, **params)
+        single = measure(hasher, args.duration, 1)
+        pooled = measure(hasher, args.duration, args.workers)
+        described = " ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{scheme:<15}{described:<28}{single:>12.1f}{pooled:>14.1f}{1000 / single:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bench_session import percentiles
+from search_index import SearchIndex, build_index
+from synthetic import WORDS, iter_questions, make_bank
+
+CATEGORIES = ("Science", "History", "Literature", "Geography")
+
+
+def time_queries(index, queries, category=None):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter_ns()
+        index.search(query, category)
+        latencies.append(time.perf_counter_ns() - started)
+    return percentiles(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the full-text index over synthetic banks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--added", type=int, default=1_000, help="questions added through the journal")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Rare terms (a question number), common words, and mixes of both
+    def make_query():
+        kind = rng.random()
+        if kind < 0.4:
+            return f"q{rng.randrange(max(args.sizes))}"
+        if kind < 0.7:
+            return " ".join(rng.sample(WORDS, 2))
+        return f"q{rng.randrange(max(args.sizes))} {rng.choice(WORDS)} {rng.choice(WORDS)}"
+    queries = [make_query() for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"bench-{size}.qidx")
+            bank = make_bank(size, CATEGORIES, args.seed)
+            started = time.perf_counter()
+            build_index(bank, path)
+            built = time.perf_counter() - started
+            del bank
+
+            started = time.perf_counter()
+            index = SearchIndex(path)
+            opened = time.perf_counter() - started
+            print(f"{size:,} questions: built in {built:.1f}s, {os.path.getsize(path) / 2 ** 20:.0f} MB, "
+                  f"opened in {opened * 1000:.1f} ms")
+
+            for label, category in (("all categories", None), ("one category", CATEGORIES[0])):
+                stats = time_queries(index, queries, category)
+                print(f"  search ({label}):  p50 {stats['p50_us'] / 1000:.2f} ms  "
+                      f"p90 {stats['p90_us'] / 1000:.2f} ms  p99 {stats['p99_us'] / 1000:.2f} ms")
+
+            extra = [question for _, question in iter_questions(args.added, CATEGORIES, args.seed + 1)]
+            started = time.perf_counter()
+            index.add_questions(CATEGORIES[0], extra)
+            added = time.perf_counter() - started
+            print(f"  add {args.added:,} questions: {added / args.added * 1e6:.1f} us each")
+            stats = time_queries(index, queries)
+            print(f"  search with journal:   p50 {stats['p50_us'] / 1000:.2f} ms  "
+                  f"p99 {stats['p99_us'] / 1000:.2f} ms")
+
+            started = time.perf_counter()
+            index.compact()
+            print(f"  compact: {time.perf_counter() - started:.1f}s")
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from question_bank import BankWriter, QuestionBank, category_size, sample_questions
+from question_store import QuestionStore
+from quiz_session import QuizSession
+from synthetic import iter_questions, make_bank
+
+CATEGORY = "Synthetic"
+
+# Relative frequency of each user action on a question
+BEHAVIOUR = {
+    "answer_correct": 45,
+    "answer_wrong": 25,
+    "next_unanswered": 5,
+    "skip": 10,
+    "previous": 10,
+    "timeout": 5,
+}
+
+
+def build_bank(size, backend, directory):
+    """Create a synthetic bank of `size` questions with the given backend."""
+    if backend == "dict":
+        return make_bank(size, (CATEGORY,))
+    if backend == "qbank":
+        path = os.path.join(directory, f"bench-{size}.qbank")
+        with BankWriter(path) as writer:
+            for category, question in iter_questions(size, (CATEGORY,)):
+                writer.add(category, question)
+        return QuestionBank(path)
+    store = QuestionStore(os.path.join(directory, f"bench-{size}.db"))
+    store.add_questions(CATEGORY, (question for _, question in iter_questions(size, (CATEGORY,))))
+    return store
+
+
+def run_session(bank, quiz_length, rng, timings):
+    """Drive one quiz the way the quiz screen does and time each operation."""
+    clock = time.perf_counter_ns
+    actions = list(BEHAVIOUR)
+    weights = list(BEHAVIOUR.values())
+
+    started = clock()
+    length = min(quiz_length, category_size(bank, CATEGORY))
+    session = QuizSession(sample_questions(bank, CATEGORY, length), CATEGORY)
+    timings["start_quiz"].append(clock() - started)
+
+    while not session.finished:
+        # load_question reads the question text and its options
+        started = clock()
+        question = session.current
+        options = question["options"]
+        session.is_time_up()
+        timings["load_question"].append(clock() - started)
+
+        action = rng.choices(actions, weights)[0]
+        started = clock()
+        if action == "answer_correct":
+            session.answer(question["answer"])
+        elif action == "answer_wrong":
+            session.answer((question["answer"] + 1) % len(options))
+        elif action == "next_unanswered":
+            session.answer(None)
+        elif action == "skip":
+            session.skip()
+        elif action == "previous":
+            session.previous()
+        else:
+            session.timeout(None)
+        timings[action].append(clock() - started)
+
+    started = clock()
+    session.results()
+    timings["show_score"].append(clock() - started)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def at(fraction):
+        return ordered[min(count - 1, int(fraction * count))] / 1000
+
+    return {"count": count, "p50_us": at(0.50), "p90_us": at(0.90), "p99_us": at(0.99),
+            "max_us": ordered[-1] / 1000}
+
+
+def bench_size(bank, sessions, quiz_length, seed):
+    timings = {name: array("q") for name in ("start_quiz", "load_question", "show_score", *BEHAVIOUR)}
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for _ in range(sessions):
+        run_session(bank, quiz_length, rng, timings)
+    elapsed = time.perf_counter() - started
+
+    # Peak Python allocations for a short second pass; tracing slows everything down
+    tracemalloc.start()
+    for _ in range(min(sessions, 100)):
+        run_session(bank, quiz_length, rng, {name: [] for name in timings})
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "sessions": sessions,
+        "seconds": elapsed,
+        "sessions_per_sec": sessions / elapsed,
+        "operations": {name: percentiles(samples) for name, samples in timings.items() if samples},
+        "peak_traced_bytes": peak,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path, results):
+    """Print sessions/sec against an earlier results file."""
+    with open(previous_path) as file:
+        previous = {run["bank_size"]: run for run in json.load(file)["runs"]}
+    for run in results["runs"]:
+        before = previous.get(run["bank_size"])
+        if before:
+            change = run["sessions_per_sec"] / before["sessions_per_sec"] - 1
+            print(f"  {run['bank_size']:>9} questions: {change:+.1%} sessions/s vs {previous_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless quiz session benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--backend", choices=("dict", "qbank", "sqlite"), default="dict")
+    parser.add_argument("--sessions", type=int, default=2_000)
+    parser.add_argument("--quiz-length", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_session.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "benchmark": "session",
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {"backend": args.backend, "sessions": args.sessions,
+                       "quiz_length": args.quiz_length, "seed": args.seed, "behaviour": BEHAVIOUR},
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            bank = build_bank(size, args.backend, directory)
+            run = bench_size(bank, args.sessions, args.quiz_length, args.seed)
+            run["bank_size"] = size
+            results["runs"].append(run)
+            if hasattr(bank, "close"):
+                bank.close()
+            ops = run["operations"]
+            print(f"{size:>9} questions: {run['sessions_per_sec']:>10,.0f} sessions/s  "
+                  f"start p50 {ops['start_quiz']['p50_us']:.1f}us p99 {ops['start_quiz']['p99_us']:.1f}us  "
+                  f"peak {run['peak_traced_bytes'] / 1024:.0f} KiB")
+    results["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import heapq
+import random
+import time
+
+from quiz_session import QUESTION_TIME
+from timer_wheel import RESOLUTION, TimerWheel
+
+
+class HeapTimers:
+    """Baseline: a binary heap with lazy cancellation, as asyncio's call_later uses."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.sequence = 0
+
+    def schedule(self, when, callback, *args):
+        entry = [when, self.sequence, callback, args, False]
+        self.sequence += 1
+        heapq.heappush(self.heap, entry)
+        return entry
+
+    def cancel(self, entry):
+        entry[4] = True  # Left in the heap until it reaches the top
+
+    def advance(self, now=None):
+        now = self.clock() if now is None else now
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            when, _, callback, args, cancelled = heapq.heappop(self.heap)
+            if not cancelled:
+                callback(*args)
+                fired += 1
+        return fired
+
+
+def run(make_timers, sessions, rearm_fraction, seed):
+    """Time scheduling, cancel-and-re-arm and timeout dispatch for `sessions` live question timers."""
+    rng = random.Random(seed)
+    now = [1000.0]
+    timers = make_timers(lambda: now[0])
+    deadlines = [now[0] + rng.uniform(1, QUESTION_TIME) for _ in range(sessions)]
+    fired = [0]
+
+    def on_timeout():
+        fired[0] += 1
+
+    started = time.perf_counter()
+    handles = [timers.schedule(when, on_timeout) for when in deadlines]
+    schedule = time.perf_counter() - started
+
+    # Examinees answer or go back before their time runs out: cancel and arm the next question
+    movers = rng.sample(range(sessions), int(sessions * rearm_fraction))
+    started = time.perf_counter()
+    for i in movers:
+        timers.cancel(handles[i])
+        handles[i] = timers.schedule(deadlines[i] + QUESTION_TIME, on_timeout)
+    rearm = time.perf_counter() - started
+
+    # Let every pending question run out, turning the scheduler once per tick as the server does
+    started = time.perf_counter()
+    end = now[0] + 2 * QUESTION_TIME + 1
+    while now[0] < end:
+        now[0] += RESOLUTION
+        timers.advance(now[0])
+    dispatch = time.perf_counter() - started
+    assert fired[0] == sessions, (fired[0], sessions)
+    return schedule / sessions, rearm / max(len(movers), 1), dispatch / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timer wheel against a heap for per-question timeouts.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--rearm", type=float, default=0.8, help="fraction of sessions that answer before timing out")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    backends = {"wheel": lambda clock: TimerWheel(clock=clock), "heap": HeapTimers}
+    print(f"{'sessions':>10} {'backend':<8}{'schedule us':>13}{'re-arm us':>12}{'dispatch us':>13}")
+    for sessions in args.sessions:
+        for name, make_timers in backends.items():
+            schedule, rearm, dispatch = run(make_timers, sessions, args.rearm, args.seed)
+            print(f"{sessions:>10,} {name:<8}{schedule * 1e6:>13.2f}{rearm * 1e6:>12.2f}{dispatch * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
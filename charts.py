@@ -0,0 +1,140 @@
+import os
+from functools import lru_cache
+from math import cos, radians, sin
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter
+
+LABELS = ['Correct', 'Incorrect', 'Not Attempted']
+COLORS = ['#0000FF', '#FF0000', '#808080']  # Blue for correct, Red for incorrect, Grey for not attempted
+EXPLODE = (0.1, 0, 0)  # Highlight correct answers
+START_ANGLE = 140
+CHART_SIZE = (4, 4)  # Inches at 100 dpi, i.e. 400x400 pixels
+CHART_PIXELS = 400
+CHART_CACHE_SIZE = 32
+
+# "qt" draws with QPainter and needs nothing beyond PyQt5; "matplotlib" is optional
+CHART_BACKEND = os.environ.get("QUIZ_CHART_BACKEND", "qt")
+CHART_KIND = os.environ.get("QUIZ_CHART_KIND", "pie")
+
+
+def render_qt(sizes, kind):
+    """Draw the chart with QPainter onto a white QImage."""
+    image = QImage(CHART_PIXELS, CHART_PIXELS, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    painter.setFont(QFont("Arial", 10))
+    try:
+        if kind == "bar":
+            _paint_bar(painter, sizes)
+        else:
+            _paint_pie(painter, sizes)
+    finally:
+        painter.end()
+    return image
+
+
+def _paint_pie(painter, sizes):
+    # Same geometry as matplotlib's pie: counterclockwise from START_ANGLE,
+    # labels at 1.1 radii and percentages at 0.6 radii from the center
+    total = sum(sizes)
+    center = CHART_PIXELS / 2
+    radius = CHART_PIXELS * 0.3
+    angle = START_ANGLE
+    for size, label, color, explode in zip(sizes, LABELS, COLORS, EXPLODE):
+        if size == 0:
+            continue
+        span = 360 * size / total
+        middle = radians(angle + span / 2)
+        # Qt's y axis points down, so the sine terms are negated
+        x = center + explode * radius * cos(middle)
+        y = center - explode * radius * sin(middle)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawPie(QRectF(x - radius, y - radius, 2 * radius, 2 * radius),
+                        round(angle * 16), round(span * 16))
+
+        painter.setPen(Qt.black)
+        label_x = x + 1.1 * radius * cos(middle)
+        label_y = y - 1.1 * radius * sin(middle)
+        if cos(middle) >= 0:
+            painter.drawText(QRectF(label_x, label_y - 10, center, 20), Qt.AlignLeft | Qt.AlignVCenter, label)
+        else:
+            painter.drawText(QRectF(label_x - center, label_y - 10, center, 20), Qt.AlignRight | Qt.AlignVCenter, label)
+        percent_x = x + 0.6 * radius * cos(middle)
+        percent_y = y - 0.6 * radius * sin(middle)
+        painter.drawText(QRectF(percent_x - 40, percent_y - 10, 80, 20), Qt.AlignCenter,
+                         f"{100 * size / total:.1f}%")
+        angle += span
+
+
+def _paint_bar(painter, sizes):
+    total = sum(sizes)
+    tallest = max(sizes)
+    margin = CHART_PIXELS * 0.1
+    baseline = CHART_PIXELS - 2 * margin
+    plot_height = baseline - margin
+    slot = (CHART_PIXELS - 2 * margin) / len(sizes)
+    bar_width = slot * 0.6
+    for i, (size, label, color) in enumerate(zip(sizes, LABELS, COLORS)):
+        height = plot_height * size / tallest
+        left = margin + i * slot + (slot - bar_width) / 2
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawRect(QRectF(left, baseline - height, bar_width, height))
+
+        painter.setPen(Qt.black)
+        painter.drawText(QRectF(left - 20, baseline - height - 22, bar_width + 40, 20), Qt.AlignCenter,
+                         f"{size} ({100 * size / total:.1f}%)")
+        painter.drawText(QRectF(margin + i * slot, baseline + 4, slot, 20), Qt.AlignCenter, label)
+    painter.drawLine(round(margin), round(baseline), round(CHART_PIXELS - margin), round(baseline))
+
+
+def render_matplotlib(sizes, kind):
+    """Draw the chart with matplotlib's Agg canvas, without touching the filesystem."""
+    # Imported here so matplotlib is only loaded when this backend is used
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=CHART_SIZE)
+    canvas = FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    if kind == "bar":
+        axes.bar(LABELS, sizes, color=COLORS)
+    else:
+        axes.pie(sizes, explode=EXPLODE, labels=LABELS, colors=COLORS, autopct='%1.1f%%', startangle=START_ANGLE)
+        axes.axis('equal')
+    canvas.draw()
+
+    width, height = canvas.get_width_height()
+    buffer = canvas.buffer_rgba()
+    # copy() detaches the image from the canvas buffer, which dies with the figure
+    return QImage(buffer, width, height, width * 4, QImage.Format_RGBA8888).copy()
+
+
+BACKENDS = {
+    "qt": render_qt,
+    "matplotlib": render_matplotlib,
+}
+
+
+def register_backend(name, renderer):
+    """Add a chart backend: `renderer(sizes, kind)` must return a QImage."""
+    BACKENDS[name] = renderer
+    render_chart.cache_clear()
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def render_chart(sizes, kind=CHART_KIND, backend=CHART_BACKEND):
+    """Render the (correct, incorrect, not attempted) results chart as a QImage.
+
+    Results are cached per counts, kind and backend.
+    """
+    try:
+        renderer = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown chart backend: {backend}") from None
+    return renderer(tuple(sizes), kind)
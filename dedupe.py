@@ -0,0 +1,215 @@
+import argparse
+import json
+import re
+import sys
+import zlib
+
+import numpy as np
+
+from question_bank import load_quiz_data
+
+NUM_PERM = 64  # MinHash values per question
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows; candidates share at least one whole band
+THRESHOLD = 0.6  # Estimated Jaccard similarity reported as a near-duplicate
+SHINGLE_SIZE = 2  # Words per shingle
+CHUNK = 10_000  # Questions hashed per NumPy batch
+MAX_BUCKET = 64  # Larger LSH buckets are paired against their first member only
+PRIME = 4294967291  # Largest prime below 2 ** 32, so signatures fit in uint32
+TOKEN = re.compile(r"\w+")
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+
+class Deduplicator:
+    """Find near-duplicate questions with word shingles, MinHash and LSH banding.
+
+    Each question (text plus options) becomes a set of word shingles, which
+    is summarised by a NUM_PERM-value MinHash signature. Signatures are cut
+    into BANDS bands; questions that agree on a whole band land in the same
+    bucket and become candidate pairs, which are kept if their signatures
+    agree on at least `threshold` of their values. Only candidates are ever
+    compared, so the run is roughly linear in the number of questions.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+        self.token_hashes = {}  # Vocabularies are small; hash each word once
+        self.keys = []  # (category, qid) per signature row
+        self.texts = []
+        self.chunks = []
+
+    def shingles(self, question):
+        """Return the 32-bit hashes of a question's word shingles."""
+        text = " ".join([question["question"], *question["options"]]).lower()
+        hashes = []
+        for word in TOKEN.findall(text):
+            value = self.token_hashes.get(word)
+            if value is None:
+                value = self.token_hashes[word] = zlib.crc32(word.encode("utf-8"))
+            hashes.append(value)
+        if len(hashes) < SHINGLE_SIZE:
+            return hashes or [0]
+        # Combine neighbouring word hashes into one shingle hash
+        shingles = hashes[:len(hashes) - SHINGLE_SIZE + 1]
+        for offset in range(1, SHINGLE_SIZE):
+            shingles = [(h * 0x01000193 ^ w) & 0xFFFFFFFF for h, w in zip(shingles, hashes[offset:])]
+        return shingles
+
+    def add_questions(self, category, questions):
+        """Hash and sign a category's questions in batches of CHUNK."""
+        lengths = []
+        flat = []
+        added = 0
+        for position, question in enumerate(questions):
+            shingles = self.shingles(question)
+            lengths.append(len(shingles))
+            flat.extend(shingles)
+            self.keys.append((category, question.get("qid", position)))
+            self.texts.append(question["question"])
+            added += 1
+            if len(lengths) == CHUNK:
+                self._sign(flat, lengths)
+                lengths, flat = [], []
+        if lengths:
+            self._sign(flat, lengths)
+        return added
+
+    def _sign(self, flat, lengths):
+        hashes = np.array(flat, dtype=np.uint64)
+        starts = np.zeros(len(lengths), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        # One row per permutation: (a * x + b) mod p for every shingle, then the minimum per question
+        permuted = (self.a * hashes + self.b) % np.uint64(PRIME)
+        self.chunks.append(np.minimum.reduceat(permuted, starts, axis=1).T.astype(np.uint32))
+
+    def signatures(self):
+        if len(self.chunks) > 1:
+            self.chunks = [np.concatenate(self.chunks)]
+        return self.chunks[0] if self.chunks else np.empty((0, self.num_perm), dtype=np.uint32)
+
+    def candidate_pairs(self):
+        """Yield index pairs that share at least one LSH band."""
+        signatures = self.signatures()
+        rows = self.num_perm // self.bands
+        seen = set()
+        for band in range(self.bands):
+            block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = np.zeros(len(signatures), dtype=np.uint64)
+            for column in block.T:
+                keys = keys * np.uint64(0x100000001B3) ^ column
+            order = np.argsort(keys, kind="stable")
+            ordered = keys[order]
+            # Runs of equal keys are the band's buckets; only runs longer than one matter
+            starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+            ends = np.r_[starts[1:], len(ordered)]
+            for start, end in zip(starts[ends - starts > 1].tolist(), ends[ends - starts > 1].tolist()):
+                members = order[start:end].tolist()
+                if len(members) <= MAX_BUCKET:
+                    pairs = ((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+                else:
+                    pairs = ((members[0], b) for b in members[1:])
+                for a, b in pairs:
+                    pair = (a, b) if a < b else (b, a)
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def duplicates(self):
+        """Return (i, j, estimated similarity) for every candidate pair above the threshold."""
+        signatures = self.signatures()
+        found = []
+        for i, j in self.candidate_pairs():
+            similarity = float(np.count_nonzero(signatures[i] == signatures[j])) / self.num_perm
+            if similarity >= self.threshold:
+                found.append((i, j, similarity))
+        return found
+
+    def clusters(self, pairs):
+        """Group near-duplicate pairs into clusters of question indices."""
+        union_find = UnionFind(len(self.keys))
+        for i, j, _ in pairs:
+            union_find.union(i, j)
+        groups = {}
+        for index in sorted({index for i, j, _ in pairs for index in (i, j)}):
+            groups.setdefault(union_find.find(index), []).append(index)
+        return list(groups.values())
+
+
+def find_duplicates(bank, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Return (deduplicator, clusters) for a `category -> questions` bank."""
+    deduplicator = Deduplicator(num_perm, bands, threshold)
+    for category in bank:
+        deduplicator.add_questions(category, bank[category])
+    return deduplicator, deduplicator.clusters(deduplicator.duplicates())
+
+
+def report(deduplicator, clusters, out=sys.stdout, as_json=False):
+    """Print each cluster, flagging clusters that span categories as likely miscategorized."""
+    entries = []
+    for members in clusters:
+        categories = {deduplicator.keys[index][0] for index in members}
+        entries.append({
+            "kind": "cross-category" if len(categories) > 1 else "within-category",
+            "questions": [{"category": deduplicator.keys[index][0], "qid": deduplicator.keys[index][1],
+                           "question": deduplicator.texts[index]} for index in members],
+        })
+    if as_json:
+        json.dump(entries, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return entries
+
+    cross = sum(entry["kind"] == "cross-category" for entry in entries)
+    print(f"{len(entries)} near-duplicate groups, {cross} spanning categories (likely miscategorized)", file=out)
+    for entry in entries:
+        print(f"\n[{entry['kind']}]", file=out)
+        for question in entry["questions"]:
+            print(f"  {question['category']} #{question['qid']}: {question['question']}", file=out)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report near-duplicate and miscategorized questions.")
+    parser.add_argument("--db", help="SQLite question store to scan (default: the bank the app loads)")
+    parser.add_argument("--bank", help="compiled bank file to scan")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="estimated Jaccard similarity")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.db:
+        from question_store import QuestionStore
+        bank = QuestionStore(args.db)
+    elif args.bank:
+        from question_bank import QuestionBank
+        bank = QuestionBank(args.bank)
+    else:
+        bank = load_quiz_data()
+    deduplicator, clusters = find_duplicates(bank, args.threshold)
+    report(deduplicator, clusters, as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+
+# Where quiz events are appended; set QUIZ_EVENT_LOG to an empty string to turn logging off
+EVENT_LOG = os.environ.get("QUIZ_EVENT_LOG", "quiz_events.jsonl")
+COMMIT_INTERVAL = 0.05  # Seconds a batch stays open for more events before it is written and fsynced
+MAX_BATCH = 4096  # Events written per group commit at most
+
+_STOP = object()
+
+
+class EventLog:
+    """Append-only JSON-lines event log with group commit.
+
+    `append` only puts the event on a queue, so it costs about a
+    microsecond on the caller's thread. A background writer takes
+    everything that arrives within COMMIT_INTERVAL of the first pending
+    event, serializes it, writes it with one call and fsyncs once per
+    batch, so durability costs one fsync per batch rather than per event.
+    """
+
+    def __init__(self, path=EVENT_LOG, commit_interval=COMMIT_INTERVAL, max_batch=MAX_BATCH, fsync=True):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.written = 0
+        self.batches = 0
+        self._file = open(path, "ab")
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, event):
+        """Queue a JSON-serializable event for the next group commit."""
+        self._queue.put(event)
+
+    def flush(self, timeout=None):
+        """Block until every event appended so far is written and fsynced."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what is queued and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            events = []
+            waiters = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    events.append(item)
+            if events:
+                self._commit(events)
+            for waiter in waiters:
+                waiter.set()
+
+    def _commit(self, events):
+        data = "".join(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in events)
+        try:
+            self._file.write(data.encode("utf-8"))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"Event log {self.path}: dropped {len(events)} events ({e})", file=sys.stderr)
+            return
+        self.written += len(events)
+        self.batches += 1
+
+
+def read_events(path=EVENT_LOG):
+    """Yield the events of a log in order, skipping a last line cut short by a crash."""
+    with open(path, "rb") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def session_logger(log, session_id=None, user=None):
+    """Return a QuizSession listener that appends each event of the session to `log`."""
+    session_id = session_id or uuid.uuid4().hex
+
+    def listener(session, event, option, ok):
+        index = session.index
+        log.append({"ts": round(time.time(), 3), "session": session_id, "user": user,
+                    "category": session.category, "qid": session.questions[index].get("qid"), "index": index,
+                    "event": event, "option": option, "ok": ok,
+                    "remaining": round(session.time_remaining[index], 2)})
+
+    return listener
+
+
+_shared_log = None
+
+
+def shared_event_log():
+    """Return the process-wide event log, or None if logging is turned off."""
+    global _shared_log
+    if _shared_log is None and EVENT_LOG:
+        _shared_log = EventLog(EVENT_LOG)
+        atexit.register(_shared_log.close)
+    return _shared_log
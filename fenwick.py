@@ -0,0 +1,90 @@
+from array import array
+
+
+class FenwickTree:
+    """Binary indexed tree over n non-negative weights.
+
+    Point updates, prefix sums and weighted search (`find`) are all
+    O(log n); building from a list of weights is O(n). Weights are stored
+    as doubles, or as signed 64-bit integers with `integer=True`.
+    """
+
+    def __init__(self, weights=(), size=None, integer=False):
+        typecode = "q" if integer else "d"
+        weights = array(typecode, weights)
+        given = len(weights)
+        if size is not None and size > len(weights):
+            weights.extend(array(typecode, [0]) * (size - len(weights)))
+        self.size = len(weights)
+        self.weights = array(typecode, weights)  # Current value of each position
+        tree = array(typecode, [0]) * (self.size + 1)
+        for i in range(self.size if given else 0):  # All-zero trees need no build pass
+            tree[i + 1] += weights[i]
+            parent = (i + 1) + ((i + 1) & -(i + 1))
+            if parent <= self.size:
+                tree[parent] += tree[i + 1]
+        self.tree = tree
+        self.mask = 1 << self.size.bit_length() if self.size else 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, index, delta):
+        """Add `delta` to the weight at `index`."""
+        self.weights[index] += delta
+        index += 1
+        tree = self.tree
+        while index <= self.size:
+            tree[index] += delta
+            index += index & -index
+
+    def set(self, index, value):
+        self.add(index, value - self.weights[index])
+
+    def prefix_sum(self, end):
+        """Return the total weight of positions [0, end)."""
+        total = 0
+        tree = self.tree
+        while end > 0:
+            total += tree[end]
+            end &= end - 1
+        return total
+
+    def total(self):
+        return self.prefix_sum(self.size)
+
+    def find(self, target):
+        """Return the smallest index whose prefix sum including itself exceeds `target`.
+
+        With `target` drawn uniformly from [0, total), this samples an index
+        with probability proportional to its weight. Returns `size` if the
+        total weight is not above `target`.
+        """
+        position = 0
+        step = self.mask
+        tree = self.tree
+        while step:
+            following = position + step
+            if following <= self.size and tree[following] <= target:
+                position = following
+                target -= tree[following]
+            step >>= 1
+        return position
+
+    def find_complement(self, target, capacity=1):
+        """Like `find`, but over the weights `capacity - weight`.
+
+        With 0/1 weights marking taken positions, this returns the index of
+        the (target + 1)-th free position without storing the free ones.
+        """
+        position = 0
+        step = self.mask
+        tree = self.tree
+        while step:
+            following = position + step
+            # Node `following` covers exactly `step` positions here
+            if following <= self.size and capacity * step - tree[following] <= target:
+                position = following
+                target -= capacity * step - tree[following]
+            step >>= 1
+        return position
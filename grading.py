@@ -0,0 +1,112 @@
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from question_bank import load_quiz_data
+from quiz_session import POINTS_CORRECT, POINTS_WRONG
+
+NOT_ATTEMPTED = -1  # Response code for a question left blank
+
+
+def answer_key(questions):
+    """Return the correct option index of each normalized question as an int8 array."""
+    return np.fromiter((question["answer"] for question in questions), dtype=np.int8, count=len(questions))
+
+
+def encode_responses(sheets, questions):
+    """Turn answer sheets of option texts (None for blank) into a candidates x questions int8 matrix."""
+    responses = np.full((len(sheets), len(questions)), NOT_ATTEMPTED, dtype=np.int8)
+    lookups = [{option: j for j, option in enumerate(question["options"])} for question in questions]
+    for row, sheet in enumerate(sheets):
+        for column, selected in enumerate(sheet):
+            if selected is not None:
+                responses[row, column] = lookups[column][selected]
+    return responses
+
+
+def grade(responses, key, points_correct=POINTS_CORRECT, points_wrong=POINTS_WRONG):
+    """Grade every candidate in one pass over a candidates x questions matrix of option indices.
+
+    Returns (score, correct, incorrect, not attempted), one int32 array entry
+    per candidate, scored the same way as the quiz screen.
+    """
+    responses = np.asarray(responses)
+    if responses.ndim != 2 or responses.shape[1] != len(key):
+        raise ValueError(f"expected a candidates x {len(key)} matrix, got shape {responses.shape}")
+    attempted = responses != NOT_ATTEMPTED
+    right = responses == key  # Broadcasts the key across every candidate's row
+    correct = np.count_nonzero(right, axis=1).astype(np.int32)
+    incorrect = np.count_nonzero(attempted, axis=1).astype(np.int32) - correct
+    not_attempted = np.int32(len(key)) - correct - incorrect
+    score = correct * points_correct + incorrect * points_wrong
+    return score, correct, incorrect, not_attempted
+
+
+def read_sheets(path, questions):
+    """Read a CSV of answer sheets: candidate id, then one option number per question.
+
+    Option numbers start at 1 and are left blank for unanswered questions.
+    A first row without a single number after the id (such as
+    "candidate,q1,q2") is taken as a header; any other invalid cell raises
+    ValueError naming its row and column.
+    """
+    count = len(questions)
+    candidates = []
+    rows = []
+    with open(path, encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        for record in reader:
+            if not record:
+                continue
+            cells = [cell.strip() for cell in record[1:]]
+            if not rows and any(cells) and not any(cell.isdigit() for cell in cells):
+                continue  # Header row
+            if len(cells) > count:
+                raise ValueError(f"{path}: row {reader.line_num} has {len(cells)} answers, "
+                                 f"the category has {count} questions")
+            row = [NOT_ATTEMPTED] * count
+            for column, cell in enumerate(cells):
+                if not cell:
+                    continue
+                options = len(questions[column]["options"])
+                if not cell.isdigit() or not 1 <= int(cell) <= options:
+                    raise ValueError(f"{path}: row {reader.line_num}, column {column + 2}: {cell!r} is not "
+                                     f"an option number from 1 to {options}")
+                row[column] = int(cell) - 1
+            candidates.append(record[0])
+            rows.append(row)
+    return candidates, np.array(rows, dtype=np.int8).reshape(len(rows), count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a CSV of answer sheets against one category.")
+    parser.add_argument("category")
+    parser.add_argument("sheets", help="CSV rows of candidate id followed by option numbers in bank order")
+    parser.add_argument("--output", help="write results as CSV here instead of printing them")
+    args = parser.parse_args()
+
+    questions = list(load_quiz_data()[args.category])
+    try:
+        candidates, responses = read_sheets(args.sheets, questions)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    score, correct, incorrect, not_attempted = grade(responses, answer_key(questions))
+
+    rows = zip(candidates, score.tolist(), correct.tolist(), incorrect.tolist(), not_attempted.tolist())
+    header = ("candidate", "score", "correct", "incorrect", "not_attempted")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+    else:
+        print(",".join(header))
+        for row in rows:
+            print(",".join(map(str, row)))
+
+
+if __name__ == "__main__":
+    main()
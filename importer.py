@@ -0,0 +1,195 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+# The quiz screen has four radio buttons, so a question needs 2 to 4 options
+MIN_OPTIONS = 2
+MAX_OPTIONS = 4
+OPTION_SEPARATOR = "|"
+
+
+def read_jsonl(path):
+    """Yield one record per non-blank line of a JSON-lines file."""
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"_error": f"line {line_number}: invalid JSON ({e.msg})"}
+
+
+def read_csv(path):
+    """Yield records from a CSV file.
+
+    Expected columns are `category`, `question`, `answer` and either
+    `options` (separated by "|") or `option1`..`option4`; `difficulty` and
+    `tags` (separated by "|") are optional.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            if row.get("options"):
+                options = row["options"].split(OPTION_SEPARATOR)
+            else:
+                options = [row[f"option{i}"] for i in range(1, MAX_OPTIONS + 1) if row.get(f"option{i}")]
+            record = {"category": row.get("category"), "question": row.get("question"),
+                      "options": options, "answer": row.get("answer")}
+            if row.get("difficulty"):
+                try:
+                    record["difficulty"] = float(row["difficulty"])
+                except ValueError:
+                    record["difficulty"] = row["difficulty"]
+            if row.get("tags"):
+                record["tags"] = row["tags"].split(OPTION_SEPARATOR)
+            yield record
+
+
+def read_records(path):
+    """Pick the reader from the file extension."""
+    if path.lower().endswith(".csv"):
+        return read_csv(path)
+    return read_jsonl(path)
+
+
+def validate_record(record):
+    """Return a description of what is wrong with a record, or None if it is valid."""
+    if not isinstance(record, dict):
+        return "record must be a JSON object"
+    if "_error" in record:
+        return record["_error"]
+    for field in ("category", "question"):
+        value = record.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return f"missing or empty {field!r}"
+    answer = record.get("answer")
+    if isinstance(answer, bool) or not isinstance(answer, (str, int)) or answer == "":
+        return "'answer' must be the text or the index of the correct option"
+    options = record.get("options")
+    if not isinstance(options, list) or not all(isinstance(o, str) and o.strip() for o in options):
+        return "'options' must be a list of non-empty strings"
+    if not MIN_OPTIONS <= len(options) <= MAX_OPTIONS:
+        return f"expected {MIN_OPTIONS} to {MAX_OPTIONS} options, got {len(options)}"
+    if len(set(options)) != len(options):
+        return "duplicate options"
+    if isinstance(answer, int):
+        if not 0 <= answer < len(options):
+            return f"answer index {answer} is out of range"
+    elif answer not in options:
+        return f"answer {answer!r} is not one of the options"
+    difficulty = record.get("difficulty", 0)
+    if isinstance(difficulty, bool) or not isinstance(difficulty, (int, float)):
+        return "'difficulty' must be a number"
+    tags = record.get("tags", [])
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        return "'tags' must be a list of strings"
+    return None
+
+
+class ImportStats:
+    """Running counters for an import, printed as a throughput report."""
+
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def report(self, out=sys.stderr):
+        elapsed = time.perf_counter() - self.started
+        print(f"read {self.read}  imported {self.imported}  rejected {self.rejected}"
+              f"  {elapsed:.1f}s  {self.rate():,.0f} rows/s", file=out)
+
+
+def import_questions(records, target, batch_size=1000, rejects=None, report_interval=5.0):
+    """Validate a stream of records and write them to `target` in batches.
+
+    `target` is anything with `add_questions(category, questions)`, i.e. a
+    QuestionStore or a BankWriter. At most `batch_size` valid records are
+    held in memory at once. Invalid records are written to the optional
+    `rejects` file object as JSON lines with an `error` field.
+    """
+    stats = ImportStats()
+    pending = {}
+    pending_count = 0
+    next_report = stats.started + report_interval
+
+    def flush():
+        for category, questions in pending.items():
+            stats.imported += target.add_questions(category, questions)
+        pending.clear()
+
+    for record in records:
+        stats.read += 1
+        error = validate_record(record)
+        if error:
+            stats.rejected += 1
+            if rejects is not None:
+                rejects.write(json.dumps({"row": stats.read, "error": error, "record": record},
+                                         ensure_ascii=False) + "\n")
+            continue
+
+        question = {key: value for key, value in record.items() if key != "category"}
+        pending.setdefault(record["category"], []).append(question)
+        pending_count += 1
+        if pending_count >= batch_size:
+            flush()
+            pending_count = 0
+            if report_interval and time.perf_counter() >= next_report:
+                stats.report()
+                next_report = time.perf_counter() + report_interval
+
+    flush()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import questions from JSON-lines or CSV files.")
+    parser.add_argument("files", nargs="+", help="input .jsonl or .csv files")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", help="SQLite question store to append to (default: quiz_data.db)")
+    target.add_argument("--bank", help="compiled bank file to append to")
+    parser.add_argument("--replace", action="store_true",
+                        help="with --bank, build the bank from the imported files only")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rejects", help="write invalid records to this JSON-lines file")
+    args = parser.parse_args(argv)
+
+    def run(writer):
+        for path in args.files:
+            print(f"Importing {path}", file=sys.stderr)
+            import_questions(read_records(path), writer, args.batch_size, rejects).report()
+
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        if args.bank:
+            from question_bank import BankWriter, QuestionBank
+            # The bank is only written if every file imports; on an error the old one is left as it was
+            with BankWriter(args.bank) as writer:
+                if os.path.exists(args.bank) and not args.replace:
+                    # A bank file cannot be appended to in place, so the existing questions are copied first
+                    with QuestionBank(args.bank) as bank:
+                        for category in bank:
+                            writer.add_questions(category, bank[category])
+                run(writer)
+        else:
+            from question_store import QUESTION_DB, QuestionStore
+            store = QuestionStore(args.db or QUESTION_DB)
+            try:
+                run(store)
+            finally:
+                store.close()
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+
+if __name__ == "__main__":
+    main()
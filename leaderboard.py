@@ -0,0 +1,293 @@
+import argparse
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from fenwick import FenwickTree
+
+LEADERBOARD_DB = "leaderboard.db"
+LEADERBOARD_FILE = "leaderboard.json"  # JSON snapshots of earlier versions, imported once
+MIN_SCORE = -1000  # Scores outside this range are clamped to it
+MAX_SCORE = 4000
+MAX_BATCH = 4096  # Score updates committed per transaction at most
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS best_scores (
+    category TEXT NOT NULL,
+    user TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    reached REAL NOT NULL,
+    PRIMARY KEY (category, user)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS attempts (
+    category TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Keeps the higher score when several processes record the same user; ties keep the earlier time
+UPSERT_BEST = """
+INSERT INTO best_scores (category, user, score, reached) VALUES (?, ?, ?, ?)
+ON CONFLICT (category, user) DO UPDATE SET score = excluded.score, reached = excluded.reached
+WHERE excluded.score > best_scores.score
+"""
+ADD_ATTEMPTS = """
+INSERT INTO attempts (category, count) VALUES (?, ?)
+ON CONFLICT (category) DO UPDATE SET count = count + excluded.count
+"""
+
+_STOP = object()
+
+
+class CategoryBoard:
+    """Best score per user in one category, ranked through a Fenwick tree over the score range.
+
+    The tree counts users per score, so "how many users scored higher"
+    is one prefix sum and the r-th best score one `find`; each score's
+    users are kept in the order they reached it, which breaks ties.
+    Recording, ranking and stepping to the next score are O(log S) for a
+    score range of S, however many users there are.
+    """
+
+    def __init__(self, min_score=MIN_SCORE, max_score=MAX_SCORE):
+        self.min_score = min_score
+        self.max_score = max_score
+        self.counts = FenwickTree(size=max_score - min_score + 1, integer=True)
+        self.buckets = {}  # Score -> {user: time the score was reached}, in order reached
+        self.best = {}  # User -> best score
+        self.attempts = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def _clamp(self, score):
+        return min(max(score, self.min_score), self.max_score)
+
+    def record(self, user, score, when=None):
+        """Count an attempt; return True if it is the user's new best.
+
+        The tree has one slot per score, so a score outside min_score ..
+        max_score is clamped to the range: the default fits any quiz of up
+        to 1000 questions.
+        """
+        self.attempts += 1
+        score = self._clamp(score)
+        previous = self.best.get(user)
+        if previous is not None and previous >= score:
+            return False
+        if previous is not None:
+            self._remove(user, previous)
+        self.best[user] = score
+        self.buckets.setdefault(score, {})[user] = time.time() if when is None else when
+        self.counts.add(score - self.min_score, 1)
+        return True
+
+    def _remove(self, user, score):
+        bucket = self.buckets[score]
+        del bucket[user]
+        if not bucket:
+            del self.buckets[score]
+        self.counts.add(score - self.min_score, -1)
+
+    def rank(self, user):
+        """Return the user's rank (1 is best, ties share a rank), or None if they have no score."""
+        score = self.best.get(user)
+        if score is None:
+            return None
+        return len(self.best) - self.counts.prefix_sum(score - self.min_score + 1) + 1
+
+    def top(self, k=100):
+        """Return up to `k` (user, score) pairs, best first."""
+        results = []
+        seen = 0
+        total = len(self.best)
+        while seen < total and len(results) < k:
+            # The (seen + 1)-th best user sits at the highest score with that many users at or above it
+            score = self.counts.find(total - seen - 1) + self.min_score
+            for user in self.buckets[score]:
+                results.append((user, score))
+                if len(results) == k:
+                    break
+            seen += len(self.buckets[score])
+        return results
+
+    @classmethod
+    def from_rows(cls, rows, attempts=0, min_score=MIN_SCORE, max_score=MAX_SCORE):
+        """Build a board from (user, score, reached) rows sorted by score, then time reached."""
+        board = cls(min_score, max_score)
+        board.attempts = attempts
+        weights = [0] * (max_score - min_score + 1)
+        for user, score, reached in rows:
+            score = board._clamp(score)
+            board.buckets.setdefault(score, {})[user] = reached
+            board.best[user] = score
+            weights[score - min_score] += 1
+        board.counts = FenwickTree(weights, integer=True)  # O(S) build instead of one add per user
+        return board
+
+
+class Leaderboard:
+    """Per-category leaderboards kept in memory and persisted to SQLite by a background thread.
+
+    `record` updates the in-memory board at once, so the caller sees its
+    new rank immediately, and queues the change; a writer thread commits
+    queued changes in batches, so a quiz screen never waits on the disk.
+    Best scores are written as "keep the higher score" upserts and attempt
+    counts as increments, so several processes sharing the database
+    (WAL mode) merge their results rather than overwrite each other.
+    A category is read from the database when it is first used, so it
+    includes what other processes had recorded by then.
+    """
+
+    def __init__(self, path=LEADERBOARD_DB, legacy_file=LEADERBOARD_FILE):
+        self.path = path
+        self.boards = {}
+        self.connection = self._connect()
+        self.connection.executescript(SCHEMA)
+        if legacy_file and os.path.exists(legacy_file) and self._empty():
+            self._import_snapshot(legacy_file)
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _empty(self):
+        return self.connection.execute("SELECT 1 FROM best_scores LIMIT 1").fetchone() is None
+
+    def board(self, category):
+        board = self.boards.get(category)
+        if board is None:
+            rows = self.connection.execute(
+                "SELECT user, score, reached FROM best_scores WHERE category = ? ORDER BY score, reached",
+                (category,))
+            attempts = self.connection.execute(
+                "SELECT count FROM attempts WHERE category = ?", (category,)).fetchone()
+            board = self.boards[category] = CategoryBoard.from_rows(rows, attempts[0] if attempts else 0)
+        return board
+
+    def record(self, category, user, score):
+        """Count an attempt; return True if it is the user's new best."""
+        board = self.board(category)
+        improved = board.record(user, score)
+        reached = board.buckets[board.best[user]][user] if improved else None
+        self._queue.put((category, user, board.best[user], reached))
+        return improved
+
+    def rank(self, category, user):
+        return self.board(category).rank(user)
+
+    def top(self, category, k=100):
+        return self.board(category).top(k)
+
+    def flush(self, timeout=None):
+        """Block until every score recorded so far is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what is queued and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        connection = self._connect()  # SQLite connections stay on the thread that made them
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH and isinstance(batch[-1], tuple):
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            updates = [item for item in batch if isinstance(item, tuple)]
+            if updates:
+                self._commit(connection, updates)
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    item.set()
+        connection.close()
+
+    def _commit(self, connection, updates):
+        attempts = {}
+        for category, _, _, _ in updates:
+            attempts[category] = attempts.get(category, 0) + 1
+        try:
+            with connection:
+                connection.executemany(UPSERT_BEST, [(category, user, score, reached)
+                                                     for category, user, score, reached in updates
+                                                     if reached is not None])
+                connection.executemany(ADD_ATTEMPTS, attempts.items())
+        except sqlite3.Error as e:
+            print(f"Leaderboard {self.path}: dropped {len(updates)} scores ({e})", file=sys.stderr)
+
+    def _import_snapshot(self, path):
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            if not self._empty():
+                return  # Another process imported it first
+            for category, board in data.items():
+                self.connection.executemany(UPSERT_BEST, [(category, user, score, reached)
+                                                          for score, users in board["scores"]
+                                                          for user, reached in users])
+                self.connection.execute(ADD_ATTEMPTS, (category, board["attempts"]))
+
+
+_shared_leaderboard = None
+
+
+def shared_leaderboard():
+    """Return the process-wide leaderboard, whose pending scores are committed at exit."""
+    global _shared_leaderboard
+    if _shared_leaderboard is None:
+        _shared_leaderboard = Leaderboard()
+        atexit.register(_shared_leaderboard.close)
+    return _shared_leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a category's leaderboard.")
+    parser.add_argument("category")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--user", help="also print this user's rank")
+    parser.add_argument("--db", default=LEADERBOARD_DB)
+    args = parser.parse_args()
+
+    leaderboard = Leaderboard(args.db)
+    board = leaderboard.board(args.category)
+    print(f"{args.category}: {len(board)} players, {board.attempts} attempts")
+    for place, (user, score) in enumerate(board.top(args.top), 1):
+        print(f"{place:>4}. {user:<24}{score:>6}")
+    if args.user:
+        rank = board.rank(args.user)
+        print(f"{args.user}: " + (f"rank {rank}, best score {board.best[args.user]}" if rank else "no score yet"))
+    leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
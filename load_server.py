@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from quiz_server import DEFAULT_PORT
+
+
+class Client:
+    """A minimal keep-alive HTTP/1.1 JSON client for one simulated examinee."""
+
+    def __init__(self, host, port, latencies):
+        self.host = host
+        self.port = port
+        self.latencies = latencies
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        started = time.perf_counter()
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = json.loads(await self.reader.readexactly(length)) if length else None
+        self.latencies.append(time.perf_counter() - started)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} -> {status}: {data}")
+        return data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+async def examinee(host, port, categories, quiz_length, think_time, latencies, stats, rng):
+    """Take one quiz with random answers, skips and back-steps."""
+    client = Client(host, port, latencies)
+    try:
+        await client.connect()
+        view = await client.request("POST", "/sessions", {"category": rng.choice(categories),
+                                                          "length": quiz_length})
+        while not view["finished"]:
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, think_time))
+            roll = rng.random()
+            path = f"/sessions/{view['id']}"
+            if roll < 0.75:
+                view = await client.request("POST", path + "/answer", {"option": rng.randrange(len(view["options"]))})
+            elif roll < 0.9:
+                view = await client.request("POST", path + "/skip")
+            else:
+                view = await client.request("POST", path + "/previous")
+        await client.request("GET", f"/sessions/{view['id']}/score")
+        stats["completed"] += 1
+    except (OSError, RuntimeError, asyncio.IncompleteReadError) as e:
+        stats["errors"] += 1
+        stats["last_error"] = str(e)
+    finally:
+        await client.close()
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args):
+    probe = Client(args.host, args.port, [])
+    await probe.connect()
+    categories = (await probe.request("GET", "/categories"))["categories"]
+    await probe.close()
+
+    latencies = []
+    stats = {"completed": 0, "errors": 0}
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited():
+        async with semaphore:
+            await examinee(args.host, args.port, categories, args.quiz_length, args.think_time,
+                           latencies, stats, random.Random(rng.random()))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies) or [0.0]
+    print(f"sessions: {stats['completed']} completed, {stats['errors']} failed "
+          f"({args.concurrency} concurrent) in {elapsed:.1f}s")
+    print(f"requests: {len(latencies)}  {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency:  p50 {percentile(ordered, 0.5) * 1000:.2f} ms  p90 {percentile(ordered, 0.9) * 1000:.2f} ms  "
+          f"p99 {percentile(ordered, 0.99) * 1000:.2f} ms  max {ordered[-1] * 1000:.2f} ms")
+    if stats["errors"]:
+        print(f"last error: {stats['last_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a running quiz_server.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=2000, help="quizzes to take in total")
+    parser.add_argument("--concurrency", type=int, default=500, help="quizzes in progress at once")
+    parser.add_argument("--quiz-length", type=int, default=20)
+    parser.add_argument("--think-time", type=float, default=0.0, help="max random pause between answers (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
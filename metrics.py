@@ -0,0 +1,169 @@
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+# Set QUIZ_METRICS to a file path to time the instrumented operations; the
+# histograms are written there at exit as JSON if the name ends in .json,
+# otherwise in the Prometheus text format (for node_exporter's textfile collector).
+METRICS_FILE = os.environ.get("QUIZ_METRICS", "")
+ENABLED = bool(METRICS_FILE)
+
+# Bucket i counts durations up to 2**i microseconds; the last one is open-ended
+BUCKETS = 27  # Up to about 67 seconds
+
+_NULL = nullcontext()
+
+
+class Histogram:
+    """Durations of one operation in power-of-two buckets, plus count, sum and maximum."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe_ns(self, ns):
+        # (ns >> 10) approximates microseconds; its bit length is the bucket
+        self.counts[min((ns >> 10).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def quantile(self, q):
+        """Estimate the q-quantile in seconds by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = (1 << (i - 1)) * 1024e-9 if i else 0.0
+                high = min((1 << i) * 1024e-9, self.max / 1e9) if i < BUCKETS - 1 else self.max / 1e9
+                return low + (high - low) * (rank - seen) / count
+            seen += count
+        return self.max / 1e9
+
+
+class Registry:
+    """Histograms by operation name."""
+
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def to_json(self):
+        return {name: {"count": h.count, "sum_seconds": h.total / 1e9, "max_seconds": h.max / 1e9,
+                       "p50_seconds": h.quantile(0.5), "p99_seconds": h.quantile(0.99),
+                       "buckets": h.counts}
+                for name, h in self.histograms.items()}
+
+    def to_prometheus(self):
+        lines = ["# HELP quiz_operation_seconds Time spent in instrumented quiz operations.",
+                 "# TYPE quiz_operation_seconds histogram"]
+        for name, h in self.histograms.items():
+            cumulative = 0
+            for i, count in enumerate(h.counts[:-1]):
+                cumulative += count
+                lines.append(f'quiz_operation_seconds_bucket{{operation="{name}",le="{(1 << i) * 1024e-9:.6g}"}} '
+                             f"{cumulative}")
+            lines.append(f'quiz_operation_seconds_bucket{{operation="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'quiz_operation_seconds_sum{{operation="{name}"}} {h.total / 1e9:.9f}')
+            lines.append(f'quiz_operation_seconds_count{{operation="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Write the histograms to `path` atomically, as JSON for *.json and Prometheus text otherwise."""
+        path = path or METRICS_FILE
+        data = (json.dumps(self.to_json(), indent=1) if path.endswith(".json") else self.to_prometheus())
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(path + ".tmp", path)  # A collector never reads a half-written file
+        except OSError as e:
+            print(f"Metrics {path}: not written ({e})", file=sys.stderr)
+
+
+registry = Registry()
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe_ns(time.perf_counter_ns() - self.started)
+
+
+def timer(name):
+    """Context manager timing its block into `name`'s histogram; a shared no-op when disabled."""
+    return _Timer(registry.histogram(name)) if ENABLED else _NULL
+
+
+def timed(name):
+    """Decorator timing each call into `name`'s histogram.
+
+    When metrics are disabled the function is returned unchanged, so the
+    instrumentation costs nothing at call time. Do not use it on Qt slots
+    connected to signals with arguments: PyQt passes them all to a
+    `*args` wrapper. Use `timer` inside the slot instead.
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+        histogram = registry.histogram(name)
+        clock = time.perf_counter_ns
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe_ns(clock() - started)
+
+        return wrapper
+
+    return decorate
+
+
+def observe(name, seconds):
+    """Record a duration measured by the caller, e.g. one that spans callbacks."""
+    if ENABLED:
+        registry.histogram(name).observe_ns(int(seconds * 1e9))
+
+
+if ENABLED:
+    atexit.register(registry.dump)
+
+
+def main():
+    # python metrics.py metrics.json -- summarize a JSON dump
+    with open(sys.argv[1], encoding="utf-8") as file:
+        data = json.load(file)
+    print(f"{'operation':<24}{'count':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, h in sorted(data.items()):
+        print(f"{name:<24}{h['count']:>10}{h['p50_seconds'] * 1e3:>10.2f}{h['p99_seconds'] * 1e3:>10.2f}"
+              f"{h['max_seconds'] * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Cost parameters; each can be overridden through the environment so slow
+# kiosks and fast servers can be tuned without code changes.
+DEFAULT_SCHEME = os.environ.get("QUIZ_KDF", "scrypt")
+SCRYPT_N = int(os.environ.get("QUIZ_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.environ.get("QUIZ_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("QUIZ_SCRYPT_P", 1))
+PBKDF2_ITERATIONS = int(os.environ.get("QUIZ_PBKDF2_ITERATIONS", 600_000))
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# hashlib's scrypt and pbkdf2_hmac release the GIL while they run, so a
+# thread pool is enough to keep them off the GUI thread.
+HASH_WORKERS = int(os.environ.get("QUIZ_HASH_WORKERS", 2))
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def legacy_sha256(password):
+    """The original unsalted SHA-256 hash, still accepted for old accounts."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def is_legacy_hash(stored):
+    return "$" not in stored and len(stored) == 64
+
+
+class PasswordHasher:
+    """Salted scrypt or PBKDF2-SHA256 hashes in a self-describing format.
+
+    Stored hashes look like `scrypt$N$r$p$salt$key` or
+    `pbkdf2_sha256$iterations$salt$key` (salt and key base64), so the cost
+    parameters travel with each hash and can be raised later.
+    """
+
+    def __init__(self, scheme=DEFAULT_SCHEME, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                 iterations=PBKDF2_ITERATIONS):
+        if scheme not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"unknown password hashing scheme: {scheme}")
+        self.scheme = scheme
+        self.n = n
+        self.r = r
+        self.p = p
+        self.iterations = iterations
+
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        if self.scheme == "scrypt":
+            key = _scrypt(password, salt, self.n, self.r, self.p)
+            return f"scrypt${self.n}${self.r}${self.p}${_b64(salt)}${_b64(key)}"
+        key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations, KEY_BYTES)
+        return f"pbkdf2_sha256${self.iterations}${_b64(salt)}${_b64(key)}"
+
+    def verify(self, password, stored):
+        """Check a password; return (matches, needs_rehash)."""
+        if is_legacy_hash(stored):
+            matches = hmac.compare_digest(legacy_sha256(password), stored)
+            return matches, matches
+
+        fields = stored.split("$")
+        try:
+            if fields[0] == "scrypt":
+                n, r, p = (int(value) for value in fields[1:4])
+                salt, key = base64.b64decode(fields[4]), base64.b64decode(fields[5])
+                candidate = _scrypt(password, salt, n, r, p, len(key))
+                current = self.scheme == "scrypt" and (n, r, p) == (self.n, self.r, self.p)
+            elif fields[0] == "pbkdf2_sha256":
+                iterations = int(fields[1])
+                salt, key = base64.b64decode(fields[2]), base64.b64decode(fields[3])
+                candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, len(key))
+                current = self.scheme == "pbkdf2_sha256" and iterations == self.iterations
+            else:
+                return False, False
+        except (IndexError, ValueError):
+            return False, False
+
+        matches = hmac.compare_digest(candidate, key)
+        return matches, matches and not current
+
+
+def _scrypt(password, salt, n, r, p, length=KEY_BYTES):
+    # scrypt needs about 128 * n * r bytes; leave headroom over OpenSSL's 32 MiB default
+    maxmem = 128 * n * r * 2 + 1024 * 1024
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=length)
+
+
+class PasswordPool:
+    """Run hashing and verification on worker threads.
+
+    Both methods return a `concurrent.futures.Future`; callers attach a done
+    callback to receive the result without blocking.
+    """
+
+    def __init__(self, hasher=None, workers=HASH_WORKERS):
+        self.hasher = hasher or PasswordHasher()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        # Verifying against this keeps unknown usernames as slow as known ones
+        self._dummy_hash = None
+
+    def hash(self, password):
+        return self.executor.submit(self.hasher.hash, password)
+
+    def verify(self, password, stored):
+        """Verify asynchronously; `stored` may be None for an unknown user."""
+        if stored is None:
+            return self.executor.submit(self._verify_unknown, password)
+        return self.executor.submit(self.hasher.verify, password, stored)
+
+    def _verify_unknown(self, password):
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hasher.hash("")
+        self.hasher.verify(password, self._dummy_hash)
+        return False, False
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt5.QtGui import QBrush, QPalette, QPixmap
+
+PIXMAP_CACHE_SIZE = 16  # Decoded images plus scaled copies
+DEFAULT_BACKGROUND_SIZE = (1400, 700)  # The window's initial size
+RESIZE_DEBOUNCE_MS = 150
+
+
+class PixmapCache:
+    """Process-wide LRU cache of decoded and scaled pixmaps.
+
+    Entries are keyed by (path, None) for the decoded image and by
+    (path, width, height) for scaled copies, so every widget showing the
+    same image at the same size shares one pixmap.
+    """
+
+    def __init__(self, max_entries=PIXMAP_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def _get(self, key, create):
+        pixmap = self._entries.get(key)
+        if pixmap is not None:
+            self._entries.move_to_end(key)
+            return pixmap
+        pixmap = create()
+        self._entries[key] = pixmap
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return pixmap
+
+    def source(self, path):
+        """Return the decoded image at `path`."""
+        return self._get((path, None), lambda: QPixmap(path))
+
+    def scaled(self, path, width, height):
+        """Return the image at `path` scaled to exactly `width` x `height`."""
+        return self._get((path, width, height), lambda: self.source(path).scaled(
+            width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    def clear(self):
+        self._entries.clear()
+
+
+pixmap_cache = PixmapCache()
+
+
+class BackgroundBinder(QObject):
+    """Keep a widget's background image scaled to the widget's size.
+
+    Resize events restart a single-shot timer, so a window being dragged to
+    a new size is rescaled once it settles rather than on every event.
+    """
+
+    def __init__(self, widget, image_path, cache=pixmap_cache, delay=RESIZE_DEBOUNCE_MS):
+        super().__init__(widget)
+        self.widget = widget
+        self.image_path = image_path
+        self.cache = cache
+        self._size = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.apply)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.widget and event.type() == QEvent.Resize:
+            self._timer.start()
+        return False
+
+    def apply(self, width=None, height=None):
+        """Paint the background at the given size, or at the widget's current size."""
+        if width is None:
+            size = self.widget.size()
+            width, height = size.width(), size.height()
+        if (width, height) == self._size or width <= 0 or height <= 0:
+            return
+        self._size = (width, height)
+        palette = self.widget.palette()
+        palette.setBrush(QPalette.Background, QBrush(self.cache.scaled(self.image_path, width, height)))
+        self.widget.setAutoFillBackground(True)
+        self.widget.setPalette(palette)
+
+
+def set_background(widget, image_path, cache=pixmap_cache):
+    """Give `widget` a background image that follows its size."""
+    binder = BackgroundBinder(widget, image_path, cache)
+    binder.apply(*DEFAULT_BACKGROUND_SIZE)
+    return binder
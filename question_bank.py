@@ -0,0 +1,359 @@
+import json
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+
+# Compiled question bank layout (all integers little-endian):
+#   header:  magic "QBNK", version (H), category count (I), table offset (Q)
+#   per category: JSON-lines records, then a (count + 1) x Q offset index,
+#            then the difficulty order: count x Q positions sorted by
+#            (difficulty, position) and count x d their difficulties
+#   table:   for each category: name length (H), name (utf-8), count (Q),
+#            data offset (Q), index offset (Q), order offset (Q)
+# Categories are only located through the table at open time; records are
+# decoded one at a time whenever they are read. Records are stored
+# normalized: `answer` is the index of the correct option and `qid` the
+# question's position in its category.
+BANK_FILE = "quiz_data.qbank"
+DIFFICULTY_FILE = "question_difficulty.json"  # Estimates written by analytics.py for banks without a database
+MAGIC = b"QBNK"
+VERSION = 3
+HEADER = struct.Struct("<4sHIQ")
+TABLE_ENTRY = struct.Struct("<QQQQ")
+OFFSET = struct.Struct("<Q")
+
+
+class CategoryView(Sequence):
+    """Read-only sequence of one category's questions, decoded on access.
+
+    Records are not cached: decoding one costs a few microseconds, and
+    keeping them would make a full scan hold the whole bank in memory.
+    """
+
+    def __init__(self, buffer, count, data_offset, index_offset):
+        self._buffer = buffer
+        self._count = count
+        self._data_offset = data_offset
+        self._index_offset = index_offset
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        start, end = struct.unpack_from("<QQ", self._buffer, self._index_offset + OFFSET.size * index)
+        return json.loads(self._buffer[self._data_offset + start:self._data_offset + end])
+
+
+class QuestionBank(Mapping):
+    """Memory-mapped `category -> questions` mapping over a compiled bank file."""
+
+    def __init__(self, path=BANK_FILE):
+        self.path = path
+        self._file = open(path, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, category_count, table_offset = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self._buffer.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a version {VERSION} question bank; recompile it"
+                             " with question_bank.py")
+
+        # Only the table is read up front; category views are built lazily
+        self._table = {}
+        position = table_offset
+        for _ in range(category_count):
+            (name_length,) = struct.unpack_from("<H", self._buffer, position)
+            position += 2
+            name = self._buffer[position:position + name_length].decode("utf-8")
+            position += name_length
+            self._table[name] = TABLE_ENTRY.unpack_from(self._buffer, position)
+            position += TABLE_ENTRY.size
+        self._views = {}
+        self._orders = {}
+
+    def __getitem__(self, category):
+        view = self._views.get(category)
+        if view is None:
+            count, data_offset, index_offset, _ = self._table[category]
+            view = CategoryView(self._buffer, count, data_offset, index_offset)
+            self._views[category] = view
+        return view
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+    def count(self, category):
+        """Return the number of questions in a category without decoding it."""
+        return self._table[category][0]
+
+    def difficulties(self, category):
+        """Return (positions, difficulties) of a category's questions in ascending difficulty.
+
+        Both are read from the order stored with the category, so no record
+        is decoded; the file never changes, so they are kept once read.
+        """
+        order = self._orders.get(category)
+        if order is None:
+            count, _, _, order_offset = self._table[category]
+            positions = array("q")
+            positions.frombytes(self._buffer[order_offset:order_offset + 8 * count])
+            levels = array("d")
+            levels.frombytes(self._buffer[order_offset + 8 * count:order_offset + 16 * count])
+            if sys.byteorder != "little":
+                positions.byteswap()
+                levels.byteswap()
+            order = self._orders[category] = positions, levels
+        return order
+
+    def close(self):
+        """Release the memory map and the underlying file."""
+        self._views.clear()
+        self._orders.clear()
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BankWriter:
+    """Build a compiled bank from a stream of (category, question) records.
+
+    Records are spooled to one temporary file per category so that memory
+    stays flat no matter how many questions are written; `close` assembles
+    the final file and atomically moves it into place.
+    """
+
+    def __init__(self, path=BANK_FILE):
+        self.path = path
+        self._spool_dir = tempfile.mkdtemp(prefix="qbank-")
+        self._spools = {}
+        self._counts = {}
+        self._levels = {}  # Category -> difficulty of each question written, in position order
+        self.count = 0
+
+    def add(self, category, question):
+        spool = self._spools.get(category)
+        if spool is None:
+            spool = open(os.path.join(self._spool_dir, f"{len(self._spools)}.jsonl"), "w+b")
+            self._spools[category] = spool
+            self._counts[category] = 0
+            self._levels[category] = array("d")
+        record = normalize_question(question, self._counts[category])
+        self._counts[category] += 1
+        self._levels[category].append(record.get("difficulty", 0.0))
+        spool.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        spool.write(b"\n")
+        self.count += 1
+
+    def add_questions(self, category, questions):
+        added = 0
+        for question in questions:
+            self.add(category, question)
+            added += 1
+        return added
+
+    def close(self):
+        """Write the compiled bank and remove the spool files."""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "wb") as out:
+                out.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+                table = []
+                for name, spool in self._spools.items():
+                    spool.seek(0)
+                    data_offset = out.tell()
+                    offsets = array("Q", [0])
+                    for line in spool:
+                        out.write(line)
+                        offsets.append(offsets[-1] + len(line))
+                    index_offset = out.tell()
+                    if sys.byteorder != "little":
+                        offsets.byteswap()
+                    offsets.tofile(out)
+                    levels = self._levels[name]
+                    positions = array("q", sorted(range(len(levels)), key=levels.__getitem__))
+                    levels = array("d", [levels[i] for i in positions])
+                    order_offset = out.tell()
+                    if sys.byteorder != "little":
+                        positions.byteswap()
+                        levels.byteswap()
+                    positions.tofile(out)
+                    levels.tofile(out)
+                    table.append((name, len(offsets) - 1, data_offset, index_offset, order_offset))
+
+                table_offset = out.tell()
+                for name, *entry in table:
+                    encoded = name.encode("utf-8")
+                    out.write(struct.pack("<H", len(encoded)))
+                    out.write(encoded)
+                    out.write(TABLE_ENTRY.pack(*entry))
+                out.seek(0)
+                out.write(HEADER.pack(MAGIC, VERSION, len(table), table_offset))
+            os.replace(temp_path, self.path)
+        finally:
+            for spool in self._spools.values():
+                spool.close()
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            for spool in self._spools.values():
+                spool.close()
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+
+def answer_index(question):
+    """Return the index of a question's correct option, validating it.
+
+    `answer` may already be an index or, as in quiz_data.py, the text of
+    the correct option.
+    """
+    options = question["options"]
+    answer = question["answer"]
+    if isinstance(answer, int) and not isinstance(answer, bool):
+        if 0 <= answer < len(options):
+            return answer
+    elif answer in options:
+        return options.index(answer)
+    raise ValueError(f"answer {answer!r} is not one of the options of {question['question']!r}")
+
+
+def normalize_question(question, qid):
+    """Return a quiz record with an integer `answer` index and a stable `qid`."""
+    record = dict(question)
+    record["answer"] = answer_index(question)
+    record["qid"] = qid
+    return record
+
+
+def normalize_bank(quiz_data, difficulties=None):
+    """Normalize every question of a `category -> questions` mapping once, up front.
+
+    `difficulties` maps category -> {qid: difficulty}, as load_difficulties returns.
+    """
+    bank = {category: [normalize_question(question, qid) for qid, question in enumerate(questions)]
+            for category, questions in quiz_data.items()}
+    for category, levels in (difficulties or {}).items():
+        questions = bank.get(category, ())
+        for qid, difficulty in levels.items():
+            if qid < len(questions):
+                questions[qid]["difficulty"] = difficulty
+    return bank
+
+
+def load_difficulties(path=DIFFICULTY_FILE):
+    """Return {category: {qid: difficulty}} from a difficulty file, or {} if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return {category: {int(qid): difficulty for qid, difficulty in levels.items()}
+            for category, levels in data.items()}
+
+
+def compile_bank(quiz_data, path=BANK_FILE):
+    """Compile a `category -> questions` mapping into a bank file."""
+    with BankWriter(path) as writer:
+        for category, questions in quiz_data.items():
+            writer.add_questions(category, questions)
+
+
+def load_quiz_data(path=BANK_FILE, database=None):
+    """Return the question bank, preferring the database, then the compiled file."""
+    from question_store import QUESTION_DB, QuestionStore
+    database = database or QUESTION_DB
+    if os.path.exists(database):
+        return QuestionStore(database)
+    if os.path.exists(path):
+        return QuestionBank(path)
+    from quiz_data import quiz_data
+    return normalize_bank(quiz_data, load_difficulties())
+
+
+def category_size(bank, category):
+    """Return the number of questions in a category of any bank type."""
+    if hasattr(bank, "count"):
+        return bank.count(category)
+    return len(bank[category])
+
+
+class LazyShuffle(Sequence):
+    """The first `length` items of a random permutation of `items`, drawn as they are read.
+
+    Reading position i runs the Fisher-Yates steps up to i; positions moved
+    by a swap are remembered in a dict, so reading k positions costs O(k)
+    time and memory however long `items` is, and re-reading is free.
+    """
+
+    def __init__(self, items, length=None, rng=random):
+        self._items = items
+        self._size = len(items)
+        self._length = self._size if length is None else min(length, self._size)
+        self._rng = rng
+        self._swaps = {}  # Position -> item index now there, for positions a swap has touched
+        self._drawn = array("q")  # Item index at each position drawn so far
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("question index out of range")
+        drawn = self._drawn
+        swaps = self._swaps
+        while len(drawn) <= index:
+            i = len(drawn)
+            j = self._rng.randrange(i, self._size)
+            drawn.append(swaps.get(j, j))
+            if j != i:
+                swaps[j] = swaps.pop(i, i)
+            else:
+                swaps.pop(i, None)
+        return self._items[drawn[index]]
+
+
+def sample_questions(bank, category, n):
+    """Draw `n` random questions, using the bank's own sampler when it has one.
+
+    Other banks get a LazyShuffle, so only the questions actually shown are
+    ever drawn or decoded.
+    """
+    if hasattr(bank, "sample"):
+        return bank.sample(category, n)
+    return LazyShuffle(bank[category], n)
+
+
+if __name__ == "__main__":
+    # python question_bank.py [output.qbank] -- compile quiz_data.py
+    from quiz_data import quiz_data
+    output = sys.argv[1] if len(sys.argv) > 1 else BANK_FILE
+    compile_bank(normalize_bank(quiz_data, load_difficulties()), output)
+    print(f"Compiled {sum(len(q) for q in quiz_data.values())} questions into {output}")
@@ -0,0 +1,209 @@
+import json
+import random
+import sqlite3
+import sys
+from array import array
+from collections.abc import Mapping
+
+from question_bank import answer_index
+
+QUESTION_DB = "quiz_data.db"
+SCHEMA_VERSION = 1  # 1: `answer` holds the index of the correct option
+
+# `position` numbers the questions of each category densely from 0, so a
+# random quiz can be drawn by sampling positions instead of rows. A
+# question's `id` doubles as its stable `qid`.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    difficulty REAL NOT NULL DEFAULT 0,
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    answer INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_category_position ON questions (category, position);
+CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty ON questions (category, difficulty);
+CREATE TABLE IF NOT EXISTS question_tags (
+    tag TEXT NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    PRIMARY KEY (tag, question_id)
+) WITHOUT ROWID;
+"""
+
+# SQLite limits the number of bound parameters per statement
+MAX_PARAMS = 500
+
+
+class QuestionStore(Mapping):
+    """SQLite-backed question bank with indexed random sampling."""
+
+    def __init__(self, path=QUESTION_DB):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self._orders = {}  # Category -> difficulties() result, valid while _orders_version holds
+        self._orders_version = None
+
+    def __getitem__(self, category):
+        """Return every question of a category (prefer `sample` for quizzes)."""
+        if category not in self:
+            raise KeyError(category)
+        rows = self.connection.execute(
+            "SELECT id, question, options, answer, difficulty FROM questions"
+            " WHERE category = ? ORDER BY position", (category,))
+        return [self._record(row) for row in rows]
+
+    def __contains__(self, category):
+        row = self.connection.execute("SELECT 1 FROM categories WHERE name = ?", (category,)).fetchone()
+        return row is not None
+
+    def __iter__(self):
+        rows = self.connection.execute("SELECT name FROM categories ORDER BY rowid").fetchall()
+        return iter([name for (name,) in rows])
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+
+    def count(self, category):
+        """Return the number of questions in a category."""
+        row = self.connection.execute("SELECT count FROM categories WHERE name = ?", (category,)).fetchone()
+        return row[0] if row else 0
+
+    def add_questions(self, category, questions):
+        """Append questions to a category in a single transaction."""
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (category,))
+            position = self.count(category)
+            added = 0
+            for question in questions:
+                cursor = self.connection.execute(
+                    "INSERT INTO questions (category, position, difficulty, question, options, answer)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (category, position, question.get("difficulty", 0), question["question"],
+                     json.dumps(question["options"], ensure_ascii=False), answer_index(question)))
+                tags = question.get("tags") or ()
+                if tags:
+                    self.connection.executemany(
+                        "INSERT OR IGNORE INTO question_tags (tag, question_id) VALUES (?, ?)",
+                        [(tag, cursor.lastrowid) for tag in tags])
+                position += 1
+                added += 1
+            self.connection.execute("UPDATE categories SET count = count + ? WHERE name = ?", (added, category))
+        self._orders.pop(category, None)
+        return added
+
+    def sample(self, category, n, difficulty=None, tag=None):
+        """Draw `n` random questions from a category without loading it.
+
+        With no filters this costs O(n): positions are sampled and fetched
+        through the (category, position) index. `difficulty` is an optional
+        (low, high) range and `tag` an optional tag; filtered draws sample
+        from the matching ids, which are read from the covering indexes only.
+        """
+        if difficulty is None and tag is None:
+            positions = random.sample(range(self.count(category)), n)
+            rows = self._fetch("position", category, positions)
+            by_position = {row[0]: row[1:] for row in rows}
+            return [self._record(by_position[position]) for position in positions]
+
+        query = "SELECT q.id FROM questions AS q"
+        params = []
+        if tag is not None:
+            query += " JOIN question_tags AS t ON t.question_id = q.id AND t.tag = ?"
+            params.append(tag)
+        query += " WHERE q.category = ?"
+        params.append(category)
+        if difficulty is not None:
+            query += " AND q.difficulty BETWEEN ? AND ?"
+            params.extend(difficulty)
+        ids = [question_id for (question_id,) in self.connection.execute(query, params)]
+        chosen = random.sample(ids, n)
+        rows = self._fetch("id", category, chosen)
+        by_id = {row[1]: row[1:] for row in rows}
+        return [self._record(by_id[question_id]) for question_id in chosen]
+
+    def question(self, qid):
+        """Return one question by its id."""
+        row = self.connection.execute(
+            "SELECT id, question, options, answer, difficulty FROM questions WHERE id = ?", (qid,)).fetchone()
+        if row is None:
+            raise KeyError(qid)
+        return self._record(row)
+
+    def difficulties(self, category):
+        """Return (ids, difficulties) of a category's questions in ascending difficulty.
+
+        Both come from the (category, difficulty) index, so no rows are read.
+        They are kept until this connection or another one writes to the
+        database, which SQLite reports through PRAGMA data_version.
+        """
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._orders_version:
+            self._orders.clear()
+            self._orders_version = version
+        order = self._orders.get(category)
+        if order is None:
+            ids = array("q")
+            difficulties = array("d")
+            for question_id, difficulty in self.connection.execute(
+                    "SELECT id, difficulty FROM questions WHERE category = ? ORDER BY difficulty, id", (category,)):
+                ids.append(question_id)
+                difficulties.append(difficulty)
+            order = self._orders[category] = ids, difficulties
+        return order
+
+    def update_difficulties(self, difficulties):
+        """Set the difficulty of questions from (qid, difficulty) pairs."""
+        with self.connection:
+            self.connection.executemany("UPDATE questions SET difficulty = ? WHERE id = ?",
+                                        ((difficulty, qid) for qid, difficulty in difficulties))
+        self._orders.clear()  # data_version only changes for other connections' writes
+
+    def close(self):
+        self.connection.close()
+
+    def _migrate(self):
+        # Databases written before answers were indices hold the answer text
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        with self.connection:
+            rows = self.connection.execute("SELECT id, question, options, answer FROM questions").fetchall()
+            self.connection.executemany(
+                "UPDATE questions SET answer = ? WHERE id = ?",
+                [(answer_index({"question": question, "options": json.loads(options), "answer": answer}), qid)
+                 for qid, question, options, answer in rows])
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _fetch(self, column, category, keys):
+        rows = []
+        for start in range(0, len(keys), MAX_PARAMS):
+            chunk = keys[start:start + MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self.connection.execute(
+                f"SELECT {column}, id, question, options, answer, difficulty FROM questions"
+                f" WHERE category = ? AND {column} IN ({placeholders})", (category, *chunk)))
+        return rows
+
+    @staticmethod
+    def _record(row):
+        qid, question, options, answer, difficulty = row
+        # int() because migrated databases keep the original TEXT column affinity
+        return {"qid": qid, "question": question, "options": json.loads(options),
+                "answer": int(answer), "difficulty": difficulty}
+
+
+if __name__ == "__main__":
+    # python question_store.py [output.db] -- load quiz_data.py into SQLite
+    from quiz_data import quiz_data
+    store = QuestionStore(sys.argv[1] if len(sys.argv) > 1 else QUESTION_DB)
+    for category, questions in quiz_data.items():
+        store.add_questions(category, questions)
+    print(f"Stored {sum(store.count(c) for c in store)} questions in {store.path}")
+    store.close()
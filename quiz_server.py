@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import json
+import math
+import secrets
+import sys
+import time
+import traceback
+
+from adaptive import AdaptiveSelector, AdaptiveSession
+from event_log import session_logger, shared_event_log
+from question_bank import category_size, load_quiz_data, sample_questions
+from quiz_session import NOT_ANSWERED, QUESTION_TIME, QuizSession
+from timer_wheel import RESOLUTION, TimerWheel
+
+DEFAULT_PORT = 8080
+SESSION_TTL = 3600  # Seconds an idle session is kept in memory
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServerSession:
+    """A QuizSession plus the wheel timer that auto-advances it when a question runs out."""
+
+    __slots__ = ("id", "user", "session", "timer", "last_seen")
+
+    def __init__(self, session_id, user, session):
+        self.id = session_id
+        self.user = user
+        self.session = session
+        self.timer = None
+        self.last_seen = time.monotonic()
+
+
+class QuizServer:
+    """Serve quiz sessions over HTTP, many examinees per process.
+
+    Endpoints (JSON bodies and responses):
+        GET  /categories
+        POST /sessions                  {"category": ..., "user": ..., "length": ..., "adaptive": false}
+        GET  /sessions/<id>
+        POST /sessions/<id>/answer      {"option": option index or null}
+        POST /sessions/<id>/skip
+        POST /sessions/<id>/previous
+        POST /sessions/<id>/finish
+        GET  /sessions/<id>/score
+    """
+
+    def __init__(self, bank=None, question_time=QUESTION_TIME, event_log=None):
+        self.bank = bank if bank is not None else load_quiz_data()
+        self.question_time = question_time
+        self.event_log = event_log if event_log is not None else shared_event_log()
+        self.sessions = {}
+        self.wheel = TimerWheel()
+
+    # Timer handling: the session keeps each question's deadline; a shared timer wheel fires them all,
+    # so answering, skipping and going back cost O(1) however many sessions are live
+
+    def _arm(self, entry):
+        if entry.session.deadline is not None:
+            entry.timer = self.wheel.schedule(entry.session.deadline, self._on_timeout, entry)
+
+    def _disarm(self, entry):
+        if entry.timer is not None:
+            self.wheel.cancel(entry.timer)
+            entry.timer = None
+
+    def _on_timeout(self, entry):
+        entry.timer = None
+        if not entry.session.expired():
+            self._arm(entry)  # Fired a little early; wait for the rest
+            return
+        entry.session.timeout(None)  # Automatically move to the next question
+        self._arm(entry)
+
+    def _move(self, entry, event, *args):
+        self._disarm(entry)
+        getattr(entry.session, event)(*args)
+        self._arm(entry)
+
+    # Views
+
+    def _view(self, entry):
+        session = entry.session
+        view = {"id": entry.id, "category": session.category, "finished": session.finished,
+                "count": len(session.questions), "index": session.index}
+        if session.finished:
+            view["results"] = self._results(entry)
+            return view
+        question = session.current
+        answered = session.answered[session.index]
+        view.update(qid=question["qid"], question=question["question"], options=question["options"],
+                    time_up=session.is_time_up(), time_left=math.ceil(session.time_left()),
+                    answered=None if answered == NOT_ANSWERED else answered)
+        return view
+
+    @staticmethod
+    def _results(entry):
+        score, correct, incorrect, not_attempted = entry.session.results()
+        return {"score": score, "correct": correct, "incorrect": incorrect, "not_attempted": not_attempted}
+
+    # Request handling
+
+    def _session(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise HttpError(404, "no such session")
+        entry.last_seen = time.monotonic()
+        return entry
+
+    def dispatch(self, method, path, body):
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if parts == ["categories"]:
+            if method != "GET":
+                raise HttpError(405, "use GET")
+            return 200, {"categories": list(self.bank)}
+
+        if parts == ["sessions"]:
+            if method != "POST":
+                raise HttpError(405, "use POST")
+            return 201, self.create_session(body)
+
+        if len(parts) in (2, 3) and parts[0] == "sessions":
+            entry = self._session(parts[1])
+            action = parts[2] if len(parts) == 3 else None
+            if action is None or action == "score":
+                if method != "GET":
+                    raise HttpError(405, "use GET")
+                return 200, self._results(entry) if action else self._view(entry)
+            if method != "POST":
+                raise HttpError(405, "use POST")
+            if entry.session.finished:
+                return 200, self._view(entry)
+            if action == "answer":
+                option = body.get("option")
+                if option is not None and (isinstance(option, bool) or not isinstance(option, int)
+                                           or not 0 <= option < len(entry.session.current["options"])):
+                    raise HttpError(400, "option must be the index of one of the question's options")
+                self._move(entry, "answer", option)
+            elif action in ("skip", "previous", "finish"):
+                self._move(entry, action)
+            else:
+                raise HttpError(404, f"unknown action {action!r}")
+            return 200, self._view(entry)
+
+        raise HttpError(404, "not found")
+
+    def create_session(self, body):
+        category = body.get("category")
+        if not isinstance(category, str) or category not in self.bank:
+            raise HttpError(400, "unknown category")
+        size = category_size(self.bank, category)
+        length = body.get("length")
+        if length is None:
+            length = size
+        if isinstance(length, bool) or not isinstance(length, int) or length < 1:
+            raise HttpError(400, "length must be a positive integer")
+        if body.get("adaptive"):
+            session = AdaptiveSession(AdaptiveSelector(self.bank, category), length, category,
+                                      question_time=self.question_time)
+        else:
+            questions = sample_questions(self.bank, category, min(length, size))
+            session = QuizSession(questions, category, self.question_time)
+        entry = ServerSession(secrets.token_urlsafe(12), body.get("user"), session)
+        if self.event_log is not None:
+            session.listener = session_logger(self.event_log, entry.id, entry.user)
+        self.sessions[entry.id] = entry
+        session.start_clock()
+        self._arm(entry)
+        return self._view(entry)
+
+    async def drive_timers(self):
+        """Turn the timer wheel once per tick, auto-advancing every question that ran out."""
+        while True:
+            await asyncio.sleep(RESOLUTION)
+            self.wheel.advance(time.monotonic())
+
+    async def expire_sessions(self):
+        """Drop sessions nobody has touched for SESSION_TTL seconds."""
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.monotonic() - SESSION_TTL
+            for session_id in [sid for sid, entry in self.sessions.items() if entry.last_seen < cutoff]:
+                self._disarm(self.sessions.pop(session_id))
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                try:
+                    length = headers.get("content-length", "0")
+                    if not (length.isascii() and length.isdigit()):
+                        keep_alive = False  # Where the next request starts is unknown
+                        raise HttpError(400, "Content-Length must be a non-negative integer")
+                    length = int(length)
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False  # The body is left unread
+                        raise HttpError(413, "request body too large")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        raise HttpError(400, "body is not valid JSON") from None
+                    if not isinstance(body, dict):
+                        raise HttpError(400, "body must be a JSON object")
+                    status, payload = self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception:
+                    # A bug in one request must not drop the connection without a response
+                    traceback.print_exc(file=sys.stderr)
+                    status, payload, keep_alive = 500, {"error": "internal server error"}, False
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, server=None):
+    server = server or QuizServer()
+    listener = await asyncio.start_server(server.handle_connection, host, port, backlog=1024)
+    expiry = asyncio.create_task(server.expire_sessions())
+    timers = asyncio.create_task(server.drive_timers())
+    print(f"Quiz server listening on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        expiry.cancel()
+        timers.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve quiz sessions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import time
+from array import array
+
+QUESTION_TIME = 30  # Seconds allowed per question
+POINTS_CORRECT = 4
+POINTS_WRONG = -1
+NOT_ANSWERED = -1  # Entry of `answered` for a question with no recorded answer
+
+
+class QuizSession:
+    """The rules of one quiz attempt, independent of any GUI.
+
+    The quiz screen, the server and the benchmarks all drive a session
+    through the same events: `answer`, `skip`, `previous`, `timeout` and
+    `finish`. Each returns True once the session has finished.
+
+    Question time is kept as a monotonic deadline rather than counted down
+    by ticks: after `start_clock` the shown question's clock runs,
+    navigating pauses it on the old question and resumes it on the new one,
+    and `time_left` is computed on demand. A stalled caller therefore never
+    stretches the time allowed.
+
+    Questions are normalized records (see `question_bank.normalize_question`):
+    answers are given as option indices and compared with the record's
+    integer `answer`.
+
+    An optional `listener(session, event, option, ok)` is called for every
+    event while the question it concerns is still current; `ok` is whether
+    the event graded an answer as correct, or None if nothing was graded.
+    """
+
+    __slots__ = ("questions", "category", "index", "score", "correct", "incorrect", "not_attempted",
+                 "answered", "time_up", "time_remaining", "finished", "points_correct", "points_wrong",
+                 "deadline", "clock", "clock_running", "listener")
+
+    def __init__(self, questions, category="", question_time=QUESTION_TIME,
+                 points_correct=POINTS_CORRECT, points_wrong=POINTS_WRONG, clock=time.monotonic, listener=None):
+        count = len(questions)
+        self.questions = questions
+        self.category = category
+        self.index = 0
+        self.score = 0
+        self.correct = 0
+        self.incorrect = 0
+        self.not_attempted = 0  # Track the number of unanswered questions
+        self.answered = array("b", [NOT_ANSWERED]) * count  # Option index chosen for each question
+        self.time_up = bytearray(count)  # 1 once a question's time has run out
+        self.time_remaining = array("f", [question_time]) * count  # Seconds left per paused question
+        self.finished = count == 0
+        self.points_correct = points_correct
+        self.points_wrong = points_wrong
+        self.deadline = None  # Monotonic time the current question runs out, None while paused
+        self.clock = clock
+        self.clock_running = False
+        self.listener = listener
+
+    @property
+    def current(self):
+        """The question being shown."""
+        return self.questions[self.index]
+
+    def is_time_up(self):
+        return bool(self.time_up[self.index])
+
+    def start_clock(self):
+        """Start the countdown; from now on each question's clock runs while it is shown."""
+        self.clock_running = True
+        self._resume()
+
+    def stop_clock(self):
+        """Stop the countdown, keeping the time the current question has left."""
+        self._pause()
+        self.clock_running = False
+
+    def time_left(self):
+        """Seconds left on the current question."""
+        if self.finished:
+            return 0.0
+        if self.deadline is None:
+            return self.time_remaining[self.index]
+        return max(self.deadline - self.clock(), 0.0)
+
+    def expired(self):
+        """True once the running clock of the current question has reached its deadline."""
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def answer(self, selected=None):
+        """Move on from the current question, grading the option index `selected` if one was chosen."""
+        self._pause()
+        self._notify("answer", selected, self._grade(selected))
+        return self._advance()
+
+    def skip(self):
+        """Skip the current question and mark it as 'Not Attempted'."""
+        self._pause()
+        self.not_attempted += 1
+        self._notify("skip")
+        return self._advance()
+
+    def previous(self):
+        """Go back one question without re-grading it."""
+        if self.index > 0:
+            self._pause()
+            self._notify("previous")
+            self.index -= 1
+            self._resume()
+        return self.finished
+
+    def timeout(self, selected=None):
+        """The current question's time ran out; grade any selection and move on."""
+        self._pause()
+        ok = self._grade(selected)  # The last grade the question can get
+        self.time_up[self.index] = 1
+        self.time_remaining[self.index] = 0
+        self._notify("timeout", selected, ok)
+        return self._advance()
+
+    def finish(self):
+        """End the attempt early."""
+        self.stop_clock()
+        if not self.finished:
+            self._notify("finish")
+        self.finished = True
+        return True
+
+    def results(self):
+        """Return (score, correct, incorrect, not attempted)."""
+        return self.score, self.correct, self.incorrect, self.not_attempted
+
+    def _grade(self, selected):
+        """Grade `selected`; return whether it was correct, or None if it was not graded.
+
+        A question whose time has run out is never graded again, even when
+        the examinee goes back to it.
+        """
+        if selected is not None and not self.time_up[self.index]:
+            if self.answered[self.index] == NOT_ANSWERED:
+                ok = selected == self.current["answer"]
+                if ok:
+                    self.score += self.points_correct
+                    self.correct += 1
+                else:
+                    self.score += self.points_wrong
+                    self.incorrect += 1
+                self.answered[self.index] = selected
+                return ok
+            else:
+                self.not_attempted += 1  # Count unanswered questions as not attempted
+        return None
+
+    def _notify(self, event, option=None, ok=None):
+        if self.listener is not None:
+            self.listener(self, event, option, ok)
+
+    def _pause(self):
+        if self.deadline is not None:
+            self.time_remaining[self.index] = max(self.deadline - self.clock(), 0.0)
+            self.deadline = None
+
+    def _resume(self):
+        if self.clock_running and not self.finished and not self.time_up[self.index]:
+            self.deadline = self.clock() + self.time_remaining[self.index]
+
+    def _advance(self):
+        self.index += 1
+        if self.index >= len(self.questions):
+            self.finished = True
+            self.clock_running = False
+        else:
+            self._resume()
+        return self.finished
@@ -0,0 +1,460 @@
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+from question_bank import category_size, load_quiz_data
+
+# Index file layout (all integers little-endian):
+#   header:   magic "QIDX", version (H), generation (H), document count (Q),
+#             term count (Q), total document length (Q), then the offsets of
+#             the sections below (Q each)
+#   docs:     qid (int64) and token count (uint32) per document, then
+#             (count + 1) uint64 offsets into the question text blob
+#   postings: per term, its document ids (uint32, ascending) then the term
+#             frequency in each (uint32)
+#   terms:    postings offset (uint64) and document frequency (uint32) per
+#             term, then (count + 1) uint64 offsets into the term blob; terms
+#             are sorted so a lookup is a binary search over the map
+#   categories: JSON list of [name, first document, end document]
+# Documents are numbered category by category, so restricting a search to a
+# category is a range cut of each postings list. Questions added after the
+# index was written go to an append-only journal next to it and are merged
+# in by `compact`.
+INDEX_FILE = "quiz_data.qidx"
+MAGIC = b"QIDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQ" + "Q" * 8)
+COMPACT_AFTER = 50_000  # Journal size at which `update` folds it into the index file
+K1 = 1.2  # BM25 term frequency saturation
+B = 0.75  # BM25 length normalization
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+def document_tokens(question):
+    """Tokens of a question and its options, which are searched together."""
+    return tokenize(" ".join([question["question"], *question["options"]]))
+
+
+def write_index(path, categories, docs, postings, generation=0):
+    """Write an index file.
+
+    `categories` is a list of (name, first, end) document ranges, `docs` a
+    list of (qid, token count, question text) in document order and
+    `postings` an iterable of (term, document ids, frequencies) sorted by term.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as out:
+        out.write(bytes(HEADER.size))
+
+        docs_offset = out.tell()
+        np.array([doc[0] for doc in docs], dtype="<i8").tofile(out)
+        lengths = np.array([doc[1] for doc in docs], dtype="<u4")
+        lengths.tofile(out)
+        texts = [doc[2].encode("utf-8") for doc in docs]
+        text_offsets = np.zeros(len(texts) + 1, dtype="<u8")
+        np.cumsum([len(text) for text in texts], out=text_offsets[1:])
+        text_offsets.tofile(out)
+        texts_offset = out.tell()
+        out.write(b"".join(texts))
+
+        postings_offset = out.tell()
+        terms = []
+        term_offsets = array("Q")
+        frequencies = array("I")
+        for term, doc_ids, counts in postings:
+            terms.append(term.encode("utf-8"))
+            term_offsets.append(out.tell())
+            frequencies.append(len(doc_ids))
+            np.asarray(doc_ids, dtype="<u4").tofile(out)
+            np.asarray(counts, dtype="<u4").tofile(out)
+
+        terms_offset = out.tell()
+        np.frombuffer(term_offsets, dtype=np.uint64).astype("<u8").tofile(out)
+        np.frombuffer(frequencies, dtype=np.uint32).astype("<u4").tofile(out)
+        string_offsets = np.zeros(len(terms) + 1, dtype="<u8")
+        np.cumsum([len(term) for term in terms], out=string_offsets[1:])
+        string_offsets.tofile(out)
+        strings_offset = out.tell()
+        out.write(b"".join(terms))
+
+        categories_offset = out.tell()
+        out.write(json.dumps(categories, ensure_ascii=False).encode("utf-8"))
+        end = out.tell()
+
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, generation, len(docs), len(terms), int(lengths.sum()),
+                              docs_offset, texts_offset, postings_offset, terms_offset, strings_offset,
+                              categories_offset, end, 0))
+    os.replace(temp_path, path)
+
+
+def build_index(bank, path=INDEX_FILE):
+    """Index every question of a `category -> questions` bank, replacing any existing index."""
+    categories = []
+    docs = []
+    postings = {}
+    for category in bank:
+        first = len(docs)
+        for position, question in enumerate(bank[category]):
+            tokens = document_tokens(question)
+            doc_id = len(docs)
+            docs.append((question.get("qid", position), len(tokens), question["question"]))
+            for term, count in Counter(tokens).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("I"))
+                entry[0].append(doc_id)
+                entry[1].append(count)
+        categories.append((category, first, len(docs)))
+    write_index(path, categories, docs, ((term, *postings[term]) for term in sorted(postings)))
+    journal = path + ".journal"
+    if os.path.exists(journal):
+        os.remove(journal)
+    return len(docs)
+
+
+class SearchIndex:
+    """Ranked keyword search over question and option text.
+
+    The index file is memory-mapped and only read where a query touches
+    it; questions added since it was written are replayed from the journal
+    into a small in-memory index. Results are ranked with BM25.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self._file = None
+        self._buffer = None
+        self.generation = 0
+        self.base_count = 0
+        self.term_count = 0
+        self.base_length = 0
+        self.categories = []
+        if os.path.exists(path):
+            self._open_base()
+        self._reset_journal()
+        self._replay_journal()
+
+    def _open_base(self):
+        self._file = open(self.path, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.generation, self.base_count, self.term_count, self.base_length,
+         docs_offset, texts_offset, postings_offset, terms_offset, strings_offset,
+         categories_offset, end, _) = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} search index; rebuild it")
+
+        n, t = self.base_count, self.term_count
+        buffer = self._buffer
+        self._qids = np.frombuffer(buffer, dtype="<i8", count=n, offset=docs_offset)
+        self._lengths = np.frombuffer(buffer, dtype="<u4", count=n, offset=docs_offset + 8 * n)
+        self._text_offsets = np.frombuffer(buffer, dtype="<u8", count=n + 1, offset=docs_offset + 12 * n)
+        self._texts_offset = texts_offset
+        self._term_postings = np.frombuffer(buffer, dtype="<u8", count=t, offset=terms_offset)
+        self._term_frequencies = np.frombuffer(buffer, dtype="<u4", count=t, offset=terms_offset + 8 * t)
+        self._string_offsets = np.frombuffer(buffer, dtype="<u8", count=t + 1, offset=terms_offset + 12 * t)
+        self._strings_offset = strings_offset
+        self.categories = [tuple(entry) for entry in json.loads(buffer[categories_offset:end])]
+        self._category_starts = [first for _, first, _ in self.categories]
+
+    def _reset_journal(self):
+        self.journal_docs = []  # (category, qid, token count, question text)
+        self.journal_postings = {}  # term -> (document ids, frequencies)
+        self.journal_length = 0
+        self._all_lengths = None
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as journal:
+            header = journal.readline()
+            try:
+                generation = json.loads(header)["generation"]
+            except (ValueError, KeyError, TypeError):
+                generation = None
+            if generation != self.generation:
+                return  # Left over from before the last compaction, which already merged it
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # A write cut short by a crash; everything before it is intact
+                self._index_journal_record(record)
+
+    def _index_journal_record(self, record):
+        tokens = document_tokens(record)
+        doc_id = self.base_count + len(self.journal_docs)
+        self.journal_docs.append((record["category"], record["qid"], len(tokens), record["question"]))
+        self.journal_length += len(tokens)
+        for term, count in Counter(tokens).items():
+            entry = self.journal_postings.get(term)
+            if entry is None:
+                entry = self.journal_postings[term] = (array("I"), array("I"))
+            entry[0].append(doc_id)
+            entry[1].append(count)
+        self._all_lengths = None
+
+    def __len__(self):
+        return self.base_count + len(self.journal_docs)
+
+    def count(self, category):
+        """Return the number of indexed questions in a category."""
+        total = sum(end - first for name, first, end in self.categories if name == category)
+        return total + sum(1 for doc in self.journal_docs if doc[0] == category)
+
+    def add_questions(self, category, questions):
+        """Index new questions by appending them to the journal."""
+        position = self.count(category)
+        added = 0
+        new_journal = not os.path.exists(self.journal_path)
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            if new_journal:
+                journal.write(json.dumps({"generation": self.generation}) + "\n")
+            for question in questions:
+                record = {"category": category, "qid": question.get("qid", position + added),
+                          "question": question["question"], "options": list(question["options"])}
+                journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._index_journal_record(record)
+                added += 1
+        return added
+
+    def update(self, bank):
+        """Index the questions a bank has gained since it was last indexed, and compact if needed.
+
+        Banks only ever append to a category, so the new questions are those
+        past the indexed count.
+        """
+        added = 0
+        for category in bank:
+            indexed = self.count(category)
+            size = category_size(bank, category)
+            if size > indexed:
+                added += self.add_questions(category, bank[category][indexed:size])
+        if len(self.journal_docs) >= COMPACT_AFTER:
+            self.compact()
+        return added
+
+    def compact(self):
+        """Merge the journal into a new index file and start an empty journal."""
+        order = [name for name, _, _ in self.categories]
+        order += [name for name in dict.fromkeys(doc[0] for doc in self.journal_docs) if name not in order]
+        journal_by_category = {}
+        for offset, doc in enumerate(self.journal_docs):
+            journal_by_category.setdefault(doc[0], []).append(offset)
+        base_ranges = {name: (first, end) for name, first, end in self.categories}
+
+        # New document numbering: per category, its indexed documents then its journal documents
+        remap = np.zeros(len(self), dtype=np.uint32)
+        categories = []
+        docs = []
+        for name in order:
+            first = len(docs)
+            base_first, base_end = base_ranges.get(name, (0, 0))
+            for doc_id in range(base_first, base_end):
+                remap[doc_id] = len(docs)
+                docs.append((int(self._qids[doc_id]), int(self._lengths[doc_id]), self.text(doc_id)))
+            for offset in journal_by_category.get(name, ()):
+                _, qid, length, text = self.journal_docs[offset]
+                remap[self.base_count + offset] = len(docs)
+                docs.append((qid, length, text))
+            categories.append((name, first, len(docs)))
+
+        def merged_postings():
+            terms = sorted(set(self._base_terms()) | set(self.journal_postings))
+            for term in terms:
+                doc_ids, counts = self._postings(term)
+                doc_ids = remap[doc_ids]
+                order = np.argsort(doc_ids, kind="stable")
+                yield term, doc_ids[order], counts[order]
+
+        generation = (self.generation + 1) & 0xFFFF
+        write_index(self.path + ".new", categories, docs, merged_postings(), generation)
+        self.close()
+        os.replace(self.path + ".new", self.path)
+        with open(self.journal_path, "w", encoding="utf-8") as journal:
+            journal.write(json.dumps({"generation": generation}) + "\n")
+        self._open_base()
+        self._reset_journal()
+
+    def search(self, query, category=None, k=10):
+        """Return up to `k` results for a keyword query, best first.
+
+        Each result is a dict with `score`, `category`, `qid` and `question`.
+        """
+        terms = set(tokenize(query))
+        total = len(self)
+        if not terms or not total:
+            return []
+        lengths = self._document_lengths()
+        average = (self.base_length + self.journal_length) / total
+
+        matched_docs = []
+        matched_scores = []
+        for term in terms:
+            doc_ids, counts = self._postings(term)
+            if not len(doc_ids):
+                continue
+            idf = math.log(1 + (total - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            if category is not None:
+                doc_ids, counts = self._restrict(doc_ids, counts, category)
+            counts = counts.astype(np.float64)
+            norm = K1 * (1 - B + B * lengths[doc_ids] / average)
+            matched_docs.append(doc_ids)
+            matched_scores.append(idf * counts * (K1 + 1) / (counts + norm))
+        if not matched_docs:
+            return []
+
+        doc_ids = np.concatenate(matched_docs)
+        weights = np.concatenate(matched_scores)
+        if len(doc_ids) > total // 8:
+            scores = np.bincount(doc_ids, weights, minlength=total)
+            candidates = np.flatnonzero(scores)
+            scores = scores[candidates]
+        else:
+            candidates, inverse = np.unique(doc_ids, return_inverse=True)
+            scores = np.bincount(inverse, weights)
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k)[:k]
+            candidates, scores = candidates[top], scores[top]
+        best = np.argsort(-scores, kind="stable")
+        return [self._result(int(candidates[i]), float(scores[i])) for i in best]
+
+    def text(self, doc_id):
+        """Return the question text of a document."""
+        if doc_id >= self.base_count:
+            return self.journal_docs[doc_id - self.base_count][3]
+        start = self._texts_offset + int(self._text_offsets[doc_id])
+        end = self._texts_offset + int(self._text_offsets[doc_id + 1])
+        return self._buffer[start:end].decode("utf-8")
+
+    def close(self):
+        if self._buffer is not None:
+            # Drop the array views first; an mmap cannot close while they exist
+            self._qids = self._lengths = self._text_offsets = None
+            self._term_postings = self._term_frequencies = self._string_offsets = None
+            self._buffer.close()
+            self._file.close()
+            self._buffer = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _result(self, doc_id, score):
+        if doc_id >= self.base_count:
+            category, qid, _, text = self.journal_docs[doc_id - self.base_count]
+        else:
+            category = self.categories[bisect_right(self._category_starts, doc_id) - 1][0]
+            qid, text = int(self._qids[doc_id]), self.text(doc_id)
+        return {"score": score, "category": category, "qid": qid, "question": text}
+
+    def _document_lengths(self):
+        if self._all_lengths is None:
+            journal = np.array([doc[2] for doc in self.journal_docs], dtype=np.uint32)
+            base = self._lengths if self.base_count else np.zeros(0, dtype=np.uint32)
+            self._all_lengths = np.concatenate([base, journal]).astype(np.float64)
+        return self._all_lengths
+
+    def _term_at(self, index):
+        start = self._strings_offset + int(self._string_offsets[index])
+        end = self._strings_offset + int(self._string_offsets[index + 1])
+        return self._buffer[start:end]
+
+    def _base_terms(self):
+        for index in range(self.term_count):
+            yield self._term_at(index).decode("utf-8")
+
+    def _find_term(self, term):
+        encoded = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term_at(low) == encoded:
+            return low
+        return None
+
+    def _postings(self, term):
+        """Return (document ids, frequencies) for a term across the index file and the journal."""
+        parts_docs = []
+        parts_counts = []
+        index = self._find_term(term) if self.base_count else None
+        if index is not None:
+            offset = int(self._term_postings[index])
+            frequency = int(self._term_frequencies[index])
+            parts_docs.append(np.frombuffer(self._buffer, dtype="<u4", count=frequency, offset=offset))
+            parts_counts.append(np.frombuffer(self._buffer, dtype="<u4", count=frequency,
+                                              offset=offset + 4 * frequency))
+        entry = self.journal_postings.get(term)
+        if entry is not None:
+            parts_docs.append(np.frombuffer(entry[0], dtype=np.uint32))
+            parts_counts.append(np.frombuffer(entry[1], dtype=np.uint32))
+        if not parts_docs:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint32)
+        if len(parts_docs) == 1:
+            return parts_docs[0].astype(np.intp), parts_counts[0]
+        return np.concatenate(parts_docs).astype(np.intp), np.concatenate(parts_counts)
+
+    def _restrict(self, doc_ids, counts, category):
+        keep = np.zeros(len(doc_ids), dtype=bool)
+        for name, first, end in self.categories:
+            if name == category:
+                # Indexed documents of a category form one range of each sorted postings list
+                low, high = np.searchsorted(doc_ids, [first, end])
+                keep[low:high] = True
+        journal = doc_ids >= self.base_count
+        if journal.any():
+            in_category = np.array([doc[0] == category for doc in self.journal_docs], dtype=bool)
+            keep[journal] = in_category[doc_ids[journal] - self.base_count]
+        return doc_ids[keep], counts[keep]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, update and search the question full-text index.")
+    parser.add_argument("--index", default=INDEX_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="index the whole question bank")
+    commands.add_parser("update", help="index questions added to the bank since the last build or update")
+    commands.add_parser("compact", help="merge the journal of added questions into the index file")
+    search = commands.add_parser("search", help="print ranked matches for a query")
+    search.add_argument("query")
+    search.add_argument("--category")
+    search.add_argument("-k", type=int, default=10, help="number of results")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Indexed {build_index(load_quiz_data(), args.index)} questions into {args.index}")
+        return
+    with SearchIndex(args.index) as index:
+        if args.command == "update":
+            print(f"Indexed {index.update(load_quiz_data())} new questions ({len(index)} in total)")
+        elif args.command == "compact":
+            index.compact()
+            print(f"Compacted {len(index)} questions into {args.index}")
+        else:
+            for result in index.search(args.query, args.category, args.k):
+                print(f"{result['score']:7.2f}  {result['category']} #{result['qid']}: {result['question']}")
+
+
+if __name__ == "__main__":
+    main()
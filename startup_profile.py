@@ -0,0 +1,81 @@
+import builtins
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# Import this module first in an entry point; with --profile-startup on the
+# command line it times every top-level import that follows it.
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+
+# Optional cold-start budget in milliseconds, reported against the total
+STARTUP_BUDGET_MS = float(os.environ.get("QUIZ_STARTUP_BUDGET_MS", 0))
+
+
+class StartupProfiler:
+    """Collect import and initialization timings up to the first idle event loop."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = []
+        self.phases = []
+        self._depth = 0
+        self._original_import = None
+
+    def install_import_hook(self):
+        """Time each import that loads a new module, attributing nested imports to the outermost one."""
+        self._original_import = original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if self._depth or level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                self.imports.append((name, time.perf_counter() - started))
+
+        builtins.__import__ = timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def report(self, out=sys.stderr):
+        """Print the timing breakdown and stop timing imports."""
+        self.remove_import_hook()
+        total = time.perf_counter() - self.started
+        print("Startup profile", file=out)
+        print("  imports:", file=out)
+        for name, seconds in sorted(self.imports, key=lambda item: item[1], reverse=True):
+            print(f"    {seconds * 1000:9.1f} ms  {name}", file=out)
+        print("  initialization:", file=out)
+        for name, seconds in self.phases:
+            print(f"    {seconds * 1000:9.1f} ms  {name}", file=out)
+        line = f"  total to first idle event loop: {total * 1000:.1f} ms"
+        if STARTUP_BUDGET_MS:
+            verdict = "within" if total * 1000 <= STARTUP_BUDGET_MS else "OVER"
+            line += f" ({verdict} budget of {STARTUP_BUDGET_MS:.0f} ms)"
+        print(line, file=out)
+        return total
+
+
+profiler = StartupProfiler()
+if PROFILE_STARTUP:
+    profiler.install_import_hook()
+
+
+def phase(name):
+    """Time a block of startup work when profiling, otherwise do nothing."""
+    return profiler.phase(name) if PROFILE_STARTUP else nullcontext()
@@ -0,0 +1,33 @@
+import random
+
+from question_bank import normalize_bank
+
+# Small vocabulary so generated questions look like text to the tokenizers
+WORDS = (
+    "which what who where when planet river ocean king queen empire war treaty element "
+    "atom cell energy force light sound number prime square triangle circle equation "
+    "author novel poem play country capital city mountain desert island language "
+    "largest smallest first last famous ancient modern chemical physical ratio formula"
+).split()
+
+
+def make_question(number, rng, words=8, options=4):
+    """Return one synthetic question in the quiz_data dict format."""
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    choices = [f"option {number}-{i}" for i in range(options)]
+    return {"question": f"Q{number}: {text}?", "options": choices, "answer": rng.choice(choices)}
+
+
+def iter_questions(count, categories=("Synthetic",), seed=0):
+    """Yield (category, question) pairs, spreading questions over the categories round-robin."""
+    rng = random.Random(seed)
+    for number in range(count):
+        yield categories[number % len(categories)], make_question(number, rng)
+
+
+def make_bank(count, categories=("Synthetic",), seed=0):
+    """Return a normalized `category -> questions` dict with `count` questions in total."""
+    bank = {category: [] for category in categories}
+    for category, question in iter_questions(count, categories, seed):
+        bank[category].append(question)
+    return normalize_bank(bank)
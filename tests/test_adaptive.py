@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from adaptive import AdaptiveSelector
+
+
+def make_bank(levels):
+    return {"Science": [{"qid": qid, "difficulty": level} for qid, level in enumerate(levels)]}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_every_question_is_asked_once(seed):
+    rng = random.Random(seed)
+    bank = make_bank([round(rng.uniform(-3, 3), 1) for _ in range(rng.randrange(1, 80))])
+    selector = AdaptiveSelector(bank, "Science", ability=rng.uniform(-2, 2), rng=random.Random(seed))
+    asked = []
+    while len(selector):
+        question = selector.next()
+        asked.append(question["qid"])
+        selector.record(question, rng.random() < 0.5)
+    assert sorted(asked) == list(range(len(bank["Science"])))
+    assert selector.asked == sorted(selector.asked)
+    with pytest.raises(IndexError):
+        selector.next()
+
+
+def test_picks_stay_in_the_window_until_it_is_empty():
+    bank = make_bank([-2.0, -1.0, 0.0, 0.1, -0.1, 1.0, 2.0])
+    selector = AdaptiveSelector(bank, "Science", target_p=0.5, rng=random.Random(1))
+    near = sorted(selector.next()["difficulty"] for _ in range(3))
+    assert near == [-0.1, 0.0, 0.1]
+    # The window is empty now, so it widens until it reaches the closest questions left
+    assert selector.next()["difficulty"] in (-1.0, 1.0)
+
+
+def test_only_asked_positions_are_kept():
+    bank = make_bank([0.0] * 100_000)
+    selector = AdaptiveSelector(bank, "Science", rng=random.Random(2))
+    for _ in range(10):
+        selector.next()
+    assert len(selector.asked) == 10
+    assert len(selector) == 100_000 - 10
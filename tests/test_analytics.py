@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+from analytics import GRADED, SECONDS, SKIPS, TIMED, aggregate, chunk_ranges
+from bench_analytics import write_log
+from quiz_session import QUESTION_TIME
+
+
+def assert_same(stats, expected):
+    # Seconds are float sums, which differ in the last bits when added in another order
+    assert stats.keys() == expected.keys()
+    for key, counters in stats.items():
+        other = expected[key]
+        assert counters[SECONDS] == pytest.approx(other[SECONDS])
+        assert counters[:SECONDS] + counters[SECONDS + 1:] == other[:SECONDS] + other[SECONDS + 1:]
+
+
+@pytest.fixture(scope="module")
+def log(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("analytics") / "events.jsonl")
+    write_log(path, 1000, 40, seed=5)
+    return path
+
+
+@pytest.mark.parametrize("chunk_bytes", [97, 1000, 4096])
+def test_byte_ranges_add_up_to_one_pass(log, chunk_bytes):
+    single = aggregate(log, workers=1, chunk_bytes=os.path.getsize(log) + 1)
+    assert single
+    assert_same(aggregate(log, workers=1, chunk_bytes=chunk_bytes), single)
+
+
+def test_ranges_cover_every_line_once(log):
+    ranges = chunk_ranges(log, 97)
+    assert ranges[0][1] == 0 and ranges[-1][2] == os.path.getsize(log)
+    assert all(previous[2] == following[1] for previous, following in zip(ranges, ranges[1:]))
+    with open(log, encoding="utf-8") as file:
+        events = [json.loads(line) for line in file]
+    stats = aggregate(log, workers=1, chunk_bytes=97)
+    assert sum(c[SKIPS] for c in stats.values()) == sum(e["event"] == "skip" for e in events)
+    assert sum(c[GRADED] for c in stats.values()) == sum(e["ok"] is not None for e in events)
+
+
+def test_process_pool_matches_one_pass(log):
+    single = aggregate(log, workers=1)
+    assert_same(aggregate(log, workers=2, chunk_bytes=8192), single)
+
+
+def test_only_graded_answers_count_seconds(tmp_path):
+    path = tmp_path / "events.jsonl"
+    base = {"category": "Science", "qid": 3, "session": "s", "index": 0}
+    events = [dict(base, event="answer", option=1, ok=True, remaining=20.0),
+              dict(base, event="answer", option=2, ok=None, remaining=12.0),  # Re-answered after going back
+              dict(base, event="timeout", option=None, ok=None, remaining=0.0),
+              dict(base, event="skip", option=None, ok=None, remaining=5.0)]
+    path.write_text("".join(json.dumps(event) + "\n" for event in events), encoding="utf-8")
+    counters = aggregate(str(path), workers=1)[("Science", 3)]
+    assert counters[GRADED] == 1
+    assert (counters[SECONDS], counters[TIMED]) == (QUESTION_TIME - 20.0, 1)
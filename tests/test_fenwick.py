@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from fenwick import FenwickTree
+
+
+def brute_find(weights, target):
+    total = 0
+    for i, weight in enumerate(weights):
+        total += weight
+        if total > target:
+            return i
+    return len(weights)
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 8, 33, 100])
+def test_find_matches_brute_force(size):
+    rng = random.Random(size)
+    weights = [rng.randrange(0, 5) for _ in range(size)]
+    tree = FenwickTree(weights, integer=True)
+    for _ in range(50):
+        index = rng.randrange(size)
+        delta = rng.randrange(0, 4)
+        tree.add(index, delta)
+        weights[index] += delta
+        assert tree.total() == sum(weights)
+        for target in range(sum(weights) + 1):
+            assert tree.find(target) == brute_find(weights, target)
+
+
+@pytest.mark.parametrize("size", [1, 5, 16, 31, 64])
+def test_find_complement_returns_free_positions(size):
+    rng = random.Random(size)
+    tree = FenwickTree(size=size, integer=True)
+    taken = set()
+    for _ in range(size):
+        free = [i for i in range(size) if i not in taken]
+        for rank, position in enumerate(free):
+            assert tree.find_complement(rank) == position
+        position = free[rng.randrange(len(free))]
+        tree.add(position, 1)
+        taken.add(position)
+    assert tree.find_complement(0) == size
+
+
+def test_prefix_sum_and_set():
+    tree = FenwickTree([1.5, 2.0, 0.5])
+    tree.set(1, 4.0)
+    assert [tree.prefix_sum(end) for end in range(4)] == [0, 1.5, 5.5, 6.0]
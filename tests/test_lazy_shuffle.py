@@ -0,0 +1,36 @@
+import random
+from collections import Counter
+
+import pytest
+
+from question_bank import LazyShuffle
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 10, 257])
+def test_full_shuffle_is_a_permutation(size):
+    items = list(range(size))
+    shuffle = LazyShuffle(items, rng=random.Random(size))
+    assert len(shuffle) == size
+    assert sorted(shuffle) == items
+
+
+def test_prefix_is_distinct_and_stable():
+    shuffle = LazyShuffle(range(1000), 50, rng=random.Random(3))
+    assert len(shuffle) == 50
+    drawn = [shuffle[i] for i in (10, 3, 49, 0)]  # Read out of order
+    assert [shuffle[i] for i in (10, 3, 49, 0)] == drawn
+    assert len(set(shuffle)) == 50
+    assert shuffle[-1] == shuffle[49]
+    with pytest.raises(IndexError):
+        shuffle[50]
+
+
+def test_length_is_capped_at_the_item_count():
+    assert sorted(LazyShuffle("abc", 10, rng=random.Random(1))) == ["a", "b", "c"]
+
+
+def test_every_ordering_is_reachable():
+    rng = random.Random(7)
+    counts = Counter(tuple(LazyShuffle(range(3), rng=rng)) for _ in range(6000))
+    assert len(counts) == 6
+    assert min(counts.values()) > 800  # 1000 expected each
@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from leaderboard import MAX_SCORE, MIN_SCORE, CategoryBoard, Leaderboard
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "leaderboard.db")
+
+
+def test_ties_share_a_rank():
+    board = CategoryBoard()
+    board.record("ann", 40, when=1)
+    board.record("bob", 40, when=2)
+    board.record("cid", 12, when=3)
+    board.record("dan", 80, when=4)
+    assert [board.rank(user) for user in ("dan", "ann", "bob", "cid")] == [1, 2, 2, 4]
+    assert board.rank("eve") is None
+
+
+def test_only_a_better_score_replaces_the_best():
+    board = CategoryBoard()
+    assert board.record("ann", 20)
+    assert not board.record("ann", 12)
+    assert not board.record("ann", 20)
+    assert board.record("ann", 36)
+    assert board.best == {"ann": 36}
+    assert board.attempts == 4
+    assert board.top() == [("ann", 36)]
+
+
+def test_top_is_ordered_by_score_then_time_reached():
+    board = CategoryBoard()
+    for when, (user, score) in enumerate([("a", 8), ("b", 20), ("c", 8), ("d", -3), ("e", 20)]):
+        board.record(user, score, when=when)
+    assert board.top() == [("b", 20), ("e", 20), ("a", 8), ("c", 8), ("d", -3)]
+    assert board.top(3) == [("b", 20), ("e", 20), ("a", 8)]
+
+
+def test_scores_are_clamped_to_the_range():
+    board = CategoryBoard()
+    board.record("ann", MAX_SCORE + 500)
+    board.record("bob", MIN_SCORE - 500)
+    assert board.best == {"ann": MAX_SCORE, "bob": MIN_SCORE}
+    assert board.top() == [("ann", MAX_SCORE), ("bob", MIN_SCORE)]
+
+
+def test_from_rows_matches_recording():
+    recorded = CategoryBoard()
+    for when, (user, score) in enumerate([("a", 8), ("b", 20), ("c", 8)]):
+        recorded.record(user, score, when=when)
+    rows = sorted(((user, score, recorded.buckets[score][user]) for user, score in recorded.best.items()),
+                  key=lambda row: (row[1], row[2]))
+    built = CategoryBoard.from_rows(rows, attempts=3)
+    assert built.top() == recorded.top()
+    assert [built.rank(user) for user in "abc"] == [recorded.rank(user) for user in "abc"]
+
+
+def test_scores_persist_across_reopen(db):
+    with Leaderboard(db, legacy_file=None) as leaderboard:
+        leaderboard.record("Science", "ann", 40)
+        leaderboard.record("Science", "bob", 12)
+        leaderboard.record("Science", "ann", 8)
+        leaderboard.record("History", "ann", 4)
+    with Leaderboard(db, legacy_file=None) as leaderboard:
+        assert leaderboard.top("Science") == [("ann", 40), ("bob", 12)]
+        assert leaderboard.board("Science").attempts == 3
+        assert leaderboard.rank("History", "ann") == 1
+
+
+def test_processes_keep_the_highest_score(db):
+    with Leaderboard(db, legacy_file=None) as leaderboard:
+        leaderboard.record("Science", "ann", 20)
+        leaderboard.record("Science", "bob", 30)
+    script = ("import sys\n"
+              "from leaderboard import Leaderboard\n"
+              "with Leaderboard(sys.argv[1], legacy_file=None) as leaderboard:\n"
+              "    leaderboard.record('Science', 'ann', 36)\n"
+              "    leaderboard.record('Science', 'bob', 4)\n")
+    subprocess.run([sys.executable, "-c", script, db], cwd=ROOT, check=True)
+    with Leaderboard(db, legacy_file=None) as leaderboard:
+        assert leaderboard.top("Science") == [("ann", 36), ("bob", 30)]
+        assert leaderboard.board("Science").attempts == 4
+
+
+def test_legacy_snapshot_is_imported_once(db, tmp_path):
+    legacy = tmp_path / "leaderboard.json"
+    legacy.write_text(json.dumps({"Science": {"attempts": 5, "scores": [[40, [["ann", 1.0], ["bob", 2.0]]],
+                                                                          [12, [["cid", 3.0]]]]}}),
+                      encoding="utf-8")
+    with Leaderboard(db, legacy_file=str(legacy)) as leaderboard:
+        assert leaderboard.top("Science") == [("ann", 40), ("bob", 40), ("cid", 12)]
+        assert leaderboard.board("Science").attempts == 5
+        leaderboard.record("Science", "cid", 16)
+    with Leaderboard(db, legacy_file=str(legacy)) as leaderboard:
+        assert leaderboard.top("Science") == [("ann", 40), ("bob", 40), ("cid", 16)]
+        assert leaderboard.board("Science").attempts == 6
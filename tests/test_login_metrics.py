@@ -0,0 +1,40 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import metrics  # noqa: E402
+
+
+@pytest.fixture
+def quiz_app(tmp_path, monkeypatch):
+    from PyQt5.QtWidgets import QApplication
+    monkeypatch.chdir(tmp_path)  # The user store is created in the working directory
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "registry", metrics.Registry())
+    app = QApplication.instance() or QApplication([])
+    import Main_File
+    window = Main_File.QuizApp()
+    yield app, window
+    window.password_pool.shutdown()
+    window.user_store.close()
+
+
+def test_login_button_with_metrics_enabled(quiz_app):
+    app, window = quiz_app
+    errors = []
+    window.show_error = errors.append  # Instead of a modal message box
+    window.username_input.setText("nobody")
+    window.password_input.setText("secret")
+    window.login_button.click()  # Emits clicked(checked=False), as a real click does
+
+    deadline = time.monotonic() + 30
+    while not errors and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert errors == ["Invalid login credentials. Please try again."]
+    assert metrics.registry.histograms["login"].count == 1
+    assert metrics.registry.histograms["login_verify"].count == 1
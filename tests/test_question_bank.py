@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from question_bank import BankWriter, QuestionBank, normalize_bank
+
+QUIZ = {
+    "Science": [
+        {"question": "H2O is?", "options": ["Water", "Salt", "Gold", "Air"], "answer": "Water", "difficulty": 0.5},
+        {"question": "Red planet?", "options": ["Venus", "Mars"], "answer": 1, "difficulty": -1.0},
+        {"question": "Speed of light?", "options": ["c", "g", "h"], "answer": "c"},
+    ],
+    "Géographie": [
+        {"question": "Capitale de la France ?", "options": ["Lyon", "Paris"], "answer": "Paris"},
+    ],
+}
+
+
+def write_bank(path, quiz):
+    with BankWriter(path) as writer:
+        for category, questions in quiz.items():
+            writer.add_questions(category, questions)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "quiz.qbank")
+    write_bank(path, QUIZ)
+    expected = normalize_bank(QUIZ)
+    with QuestionBank(path) as bank:
+        assert list(bank) == list(QUIZ)
+        for category, questions in expected.items():
+            assert bank.count(category) == len(questions)
+            assert list(bank[category]) == questions
+            assert bank[category][-1] == questions[-1]
+            assert bank[category][1:] == questions[1:]
+        with pytest.raises(IndexError):
+            bank["Science"][3]
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_difficulty_order_is_stored(tmp_path):
+    path = str(tmp_path / "quiz.qbank")
+    write_bank(path, QUIZ)
+    with QuestionBank(path) as bank:
+        positions, levels = bank.difficulties("Science")
+        assert list(positions) == [1, 2, 0]
+        assert list(levels) == [-1.0, 0.0, 0.5]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.qbank"
+    path.write_bytes(b"JUNK" + bytes(64))
+    with pytest.raises(ValueError):
+        QuestionBank(str(path))
+
+
+def test_invalid_answer_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_bank(str(tmp_path / "bad.qbank"),
+                   {"Science": [{"question": "?", "options": ["a", "b"], "answer": "c"}]})
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from question_bank import normalize_bank
+from quiz_server import HttpError, QuizServer
+
+QUIZ_DATA = {
+    "Science": [{"question": f"Q{i}?", "options": ["a", "b", "c", "d"], "answer": "abcd"[i % 4]}
+                for i in range(5)],
+}
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def server(events):
+    return QuizServer(normalize_bank(QUIZ_DATA), event_log=events)
+
+
+def create(server, **body):
+    status, view = server.dispatch("POST", "/sessions", dict({"category": "Science"}, **body))
+    assert status == 201
+    return view
+
+
+def test_categories(server):
+    assert server.dispatch("GET", "/categories", {}) == (200, {"categories": ["Science"]})
+
+
+def test_session_runs_to_the_score(server, events):
+    view = create(server, user="ann", length=3)
+    assert (view["count"], view["index"], view["time_left"], view["answered"]) == (3, 0, 30, None)
+    path = f"/sessions/{view['id']}"
+    answer = server.bank["Science"][view["qid"]]["answer"]
+    status, view = server.dispatch("POST", path + "/answer", {"option": answer})
+    assert (status, view["index"]) == (200, 1)
+    _, view = server.dispatch("POST", path + "/previous", {})
+    assert (view["index"], view["answered"]) == (0, answer)
+    server.dispatch("POST", path + "/answer", {"option": None})
+    server.dispatch("POST", path + "/skip", {})
+    _, view = server.dispatch("POST", path + "/finish", {})
+    assert view["finished"]
+    assert view["results"] == {"score": 4, "correct": 1, "incorrect": 0, "not_attempted": 1}
+    assert server.dispatch("GET", path + "/score", {}) == (200, view["results"])
+    assert [event["event"] for event in events] == ["answer", "previous", "answer", "skip", "finish"]
+    assert {event["user"] for event in events} == {"ann"}
+
+
+def test_adaptive_session(server):
+    view = create(server, length=2, adaptive=True)
+    path = f"/sessions/{view['id']}"
+    server.dispatch("POST", path + "/answer", {"option": 0})
+    _, view = server.dispatch("POST", path + "/answer", {"option": 0})
+    assert view["finished"]
+
+
+@pytest.mark.parametrize("body", [{"category": "Art"}, {"category": ["Science"]}, {}])
+def test_bad_category(server, body):
+    with pytest.raises(HttpError) as raised:
+        server.dispatch("POST", "/sessions", body)
+    assert raised.value.status == 400
+
+
+@pytest.mark.parametrize("length", [0, -2, 1.5, "3", True])
+def test_bad_length(server, length):
+    with pytest.raises(HttpError) as raised:
+        create(server, length=length)
+    assert raised.value.status == 400
+
+
+@pytest.mark.parametrize("option", [4, -1, "0", 1.0, False])
+def test_bad_option(server, option):
+    path = f"/sessions/{create(server)['id']}"
+    with pytest.raises(HttpError) as raised:
+        server.dispatch("POST", path + "/answer", {"option": option})
+    assert raised.value.status == 400
+    assert server.dispatch("GET", path, {})[1]["index"] == 0
+
+
+@pytest.mark.parametrize("method, path, status", [
+    ("GET", "/sessions/nope", 404),
+    ("POST", "/categories", 405),
+    ("GET", "/sessions", 405),
+    ("GET", "/elsewhere", 404),
+])
+def test_routing_errors(server, method, path, status):
+    with pytest.raises(HttpError) as raised:
+        server.dispatch(method, path, {})
+    assert raised.value.status == status
+
+
+def test_unknown_action(server):
+    with pytest.raises(HttpError) as raised:
+        server.dispatch("POST", f"/sessions/{create(server)['id']}/jump", {})
+    assert raised.value.status == 404
+
+
+def request(server, raw):
+    """Send raw request bytes over a real connection; return (status, body) of the response."""
+    async def exchange():
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()  # Until the server closes the connection
+            writer.close()
+        return response
+
+    head, _, body = asyncio.run(exchange()).partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3", "\xb2"])
+def test_bad_content_length(server, length):
+    status, body = request(server, f"POST /sessions HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}"
+                           .encode("latin-1"))
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+
+def test_request_over_a_connection(server):
+    body = json.dumps({"category": "Science", "length": 2}).encode()
+    status, view = request(server, b"POST /sessions HTTP/1.1\r\nConnection: close\r\n"
+                                   b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert (status, view["count"]) == (201, 2)
@@ -0,0 +1,132 @@
+import pytest
+
+from quiz_session import POINTS_CORRECT, POINTS_WRONG, QUESTION_TIME, QuizSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_questions(count):
+    return [{"qid": i, "question": f"Q{i}?", "options": ["a", "b", "c", "d"], "answer": i % 4}
+            for i in range(count)]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_counts_and_score(clock):
+    session = QuizSession(make_questions(4), clock=clock)
+    assert not session.answer(0)  # Correct
+    assert not session.answer(0)  # Wrong
+    assert not session.skip()
+    assert session.answer(3)  # Correct, last question
+    assert session.finished
+    assert session.results() == (2 * POINTS_CORRECT + POINTS_WRONG, 2, 1, 1)
+
+
+def test_going_back_does_not_regrade(clock):
+    session = QuizSession(make_questions(3), clock=clock)
+    session.answer(1)  # Wrong
+    session.previous()
+    assert session.index == 0
+    session.answer(0)  # Would be correct, but the question was already graded
+    assert session.index == 1
+    assert session.results() == (POINTS_WRONG, 0, 1, 1)
+    assert session.answered[0] == 1
+
+
+def test_skipped_question_can_be_answered_after_going_back(clock):
+    session = QuizSession(make_questions(2), clock=clock)
+    session.skip()
+    session.previous()
+    session.answer(0)
+    assert session.results() == (POINTS_CORRECT, 1, 0, 1)
+
+
+def test_timeout_advances_with_a_fresh_clock(clock):
+    session = QuizSession(make_questions(3), clock=clock)
+    session.start_clock()
+    assert session.time_left() == QUESTION_TIME
+    clock.now += QUESTION_TIME - 1
+    assert not session.expired()
+    assert session.time_left() == pytest.approx(1)
+    clock.now += 1
+    assert session.expired()
+    session.timeout(0)  # A selection made before time ran out is still graded
+    assert session.index == 1
+    assert session.results() == (POINTS_CORRECT, 1, 0, 0)
+    assert session.time_left() == QUESTION_TIME
+    assert not session.expired()
+
+
+def test_timed_out_question_is_not_graded_again(clock):
+    session = QuizSession(make_questions(2), clock=clock)
+    session.start_clock()
+    clock.now += QUESTION_TIME
+    session.timeout()
+    session.previous()
+    assert session.is_time_up()
+    assert session.time_left() == 0
+    assert not session.expired()  # Its clock does not run again
+    session.answer(0)
+    assert session.results() == (0, 0, 0, 0)
+
+
+def test_navigation_pauses_the_clock(clock):
+    session = QuizSession(make_questions(2), clock=clock)
+    session.start_clock()
+    clock.now += 10
+    session.answer(0)
+    clock.now += 5
+    session.previous()
+    assert session.time_left() == pytest.approx(QUESTION_TIME - 10)
+    clock.now += 100  # A stalled caller does not stretch the time allowed
+    assert session.expired()
+
+
+def test_finish_early(clock):
+    session = QuizSession(make_questions(5), clock=clock)
+    session.start_clock()
+    session.answer(0)
+    assert session.finish()
+    assert session.finished
+    assert session.time_left() == 0.0
+    assert not session.expired()
+    assert session.results() == (POINTS_CORRECT, 1, 0, 0)
+
+
+def test_empty_session_is_finished():
+    assert QuizSession([]).finished
+
+
+def test_listener_events(clock):
+    events = []
+
+    def listener(session, event, option, ok):
+        events.append((session.index, event, option, ok))
+
+    session = QuizSession(make_questions(4), clock=clock, listener=listener)
+    session.start_clock()
+    session.answer(0)
+    session.skip()
+    session.previous()
+    session.skip()
+    clock.now += QUESTION_TIME
+    session.timeout(1)
+    session.finish()
+    session.finish()  # Only reported once
+    assert events == [
+        (0, "answer", 0, True),
+        (1, "skip", None, None),
+        (2, "previous", None, None),
+        (1, "skip", None, None),
+        (2, "timeout", 1, False),
+        (3, "finish", None, None),
+    ]
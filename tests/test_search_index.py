@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from question_bank import normalize_bank  # noqa: E402
+from search_index import SearchIndex, build_index  # noqa: E402
+
+QUIZ = normalize_bank({
+    "Science": [
+        {"question": "What is the chemical symbol for water?", "options": ["H2O", "CO2", "O2", "NaCl"],
+         "answer": "H2O"},
+        {"question": "Which planet is known as the red planet?", "options": ["Mars", "Venus"], "answer": "Mars"},
+    ],
+    "Geography": [
+        {"question": "Which river flows through Cairo?", "options": ["Nile", "Amazon"], "answer": "Nile"},
+        {"question": "Which ocean is the largest body of water?", "options": ["Pacific", "Atlantic"],
+         "answer": "Pacific"},
+    ],
+})
+NEW = [{"question": "Which planet has the most moons?", "options": ["Saturn", "Earth"], "answer": 0}]
+
+
+def hits(index, query, category=None):
+    return [(result["category"], result["qid"]) for result in index.search(query, category)]
+
+
+def test_build_and_search(tmp_path):
+    path = str(tmp_path / "quiz.qidx")
+    assert build_index(QUIZ, path) == 4
+    with SearchIndex(path) as index:
+        assert len(index) == 4
+        assert index.count("Geography") == 2
+        assert set(hits(index, "water")) == {("Science", 0), ("Geography", 1)}
+        assert hits(index, "water", "Geography") == [("Geography", 1)]
+        assert hits(index, "planet red")[0] == ("Science", 1)
+        assert index.search("planet")[0]["question"] == "Which planet is known as the red planet?"
+        assert hits(index, "zebra") == []
+
+
+def test_journal_is_replayed_and_compacted(tmp_path):
+    path = str(tmp_path / "quiz.qidx")
+    build_index(QUIZ, path)
+    with SearchIndex(path) as index:
+        index.add_questions("Science", NEW)
+        before = hits(index, "planet")
+    with SearchIndex(path) as index:  # Reopened: the new question comes from the journal
+        assert len(index) == 5
+        assert hits(index, "planet") == before
+        assert ("Science", 2) in before
+        index.compact()
+        assert hits(index, "planet") == before
+    with SearchIndex(path) as index:  # Reopened after compaction: everything is in the file
+        assert len(index) == 5 and not index.journal_docs
+        assert hits(index, "planet") == before
+        assert hits(index, "moons", "Science") == [("Science", 2)]
+
+
+def test_update_indexes_only_new_questions(tmp_path):
+    path = str(tmp_path / "quiz.qidx")
+    build_index(QUIZ, path)
+    grown = dict(QUIZ, Science=QUIZ["Science"] + [dict(NEW[0], qid=2)])
+    with SearchIndex(path) as index:
+        assert index.update(grown) == 1
+        assert index.update(grown) == 0
+        assert index.count("Science") == 3
@@ -0,0 +1,64 @@
+import random
+
+from timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_wheel(**kwargs):
+    clock = FakeClock()
+    return TimerWheel(resolution=0.1, clock=clock, **kwargs), clock
+
+
+def test_timers_never_fire_early_and_fire_within_a_tick():
+    # Two-bit levels make the cascade between levels happen often
+    wheel, clock = make_wheel(slot_bits=2, levels=3)
+    rng = random.Random(1)
+    fired = []
+    deadlines = [rng.uniform(0, 20) for _ in range(500)]
+    for when in deadlines:
+        wheel.schedule(when, lambda when=when: fired.append((when, clock.now)))
+    while clock.now < 21:
+        clock.now += rng.uniform(0.01, 0.3)
+        wheel.advance()
+    assert len(fired) == len(deadlines)
+    assert len(wheel) == 0
+    for when, at in fired:
+        assert at >= when
+    # Each timer fires on the first advance that reaches its tick, so at most a step plus a tick late
+    assert max(at - when for when, at in fired) < 0.3 + 0.1 + 1e-9
+
+
+def test_cascade_across_every_level_and_overflow():
+    wheel, clock = make_wheel(slot_bits=2, levels=2)  # 16 ticks before the overflow bucket
+    fired = []
+    for when in (0.35, 1.55, 1.65, 6.45, 25.05):
+        wheel.schedule(when, fired.append, when)
+    for step in range(1, 300):
+        clock.now = step * 0.1
+        wheel.advance()
+        assert all(when <= clock.now + 1e-9 for when in fired)
+    assert fired == [0.35, 1.55, 1.65, 6.45, 25.05]
+
+
+def test_cancel():
+    wheel, clock = make_wheel()
+    fired = []
+    keep = wheel.schedule(1.0, fired.append, "keep")
+    drop = wheel.schedule(1.0, fired.append, "drop")
+    far = wheel.call_later(1000.0, fired.append, "far")
+    wheel.cancel(drop)
+    wheel.cancel(far)
+    wheel.cancel(drop)  # Cancelling twice does nothing
+    assert len(wheel) == 1 and drop.cancelled() and not keep.cancelled()
+    clock.now = 2000.0
+    assert wheel.advance() == 1
+    assert fired == ["keep"]
+    wheel.cancel(keep)  # Already fired
+    assert len(wheel) == 0
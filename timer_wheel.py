@@ -0,0 +1,111 @@
+import math
+import time
+
+RESOLUTION = 0.1  # Seconds per tick
+SLOT_BITS = 8  # 256 slots per level
+LEVELS = 4  # 256 ** 4 ticks, about 13.6 years at 0.1 s
+
+
+class TimerHandle:
+    """A scheduled callback, cancelled through `TimerWheel.cancel`."""
+
+    __slots__ = ("when", "tick", "callback", "args", "bucket")
+
+    def __init__(self, when, tick, callback, args):
+        self.when = when
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.bucket = None
+
+    def cancelled(self):
+        return self.bucket is None
+
+
+class TimerWheel:
+    """Hierarchical timing wheel for very many coarse-grained timeouts.
+
+    Scheduling and cancelling are O(1): a timer is placed in the lowest
+    level whose span contains its expiry tick, in a dict-backed slot, and
+    moves down one level at a time as the wheel turns, so each timer is
+    touched at most LEVELS times before it fires. Timers fire on the first
+    `advance` at or after their deadline, never before it.
+    """
+
+    def __init__(self, resolution=RESOLUTION, slot_bits=SLOT_BITS, levels=LEVELS, clock=time.monotonic):
+        self.resolution = resolution
+        self.slot_bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        self.levels = levels
+        self.clock = clock
+        self.wheels = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.overflow = {}  # Timers beyond the top level's span
+        self.current = math.floor(clock() / resolution)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, when, callback, *args):
+        """Call `callback(*args)` once the clock reaches `when`."""
+        handle = TimerHandle(when, math.ceil(when / self.resolution), callback, args)
+        self._insert(handle, max(handle.tick, self.current + 1))  # The current tick has already run
+        self.count += 1
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        return self.schedule(self.clock() + delay, callback, *args)
+
+    def cancel(self, handle):
+        """Remove a pending timer in O(1); cancelling a fired or cancelled timer does nothing."""
+        if handle.bucket is not None:
+            del handle.bucket[handle]
+            handle.bucket = None
+            self.count -= 1
+
+    def _insert(self, handle, tick):
+        # Lowest level at which the expiry and the current tick share all higher digits
+        level = max((tick ^ self.current).bit_length() - 1, 0) // self.slot_bits
+        if level < self.levels:
+            bucket = self.wheels[level][(tick >> (self.slot_bits * level)) & self.mask]
+        else:
+            bucket = self.overflow
+        bucket[handle] = None
+        handle.bucket = bucket
+
+    def _cascade(self, bucket):
+        handles = list(bucket)
+        bucket.clear()
+        for handle in handles:
+            # Cascades run before the current tick's slot, so a timer due now still fires on this tick
+            self._insert(handle, max(handle.tick, self.current))
+
+    def advance(self, now=None):
+        """Turn the wheel up to `now` and run every timer that has come due; return how many ran."""
+        target = math.floor((self.clock() if now is None else now) / self.resolution)
+        if self.count == 0:
+            self.current = max(self.current, target)
+            return 0
+
+        fired = 0
+        while self.current < target:
+            self.current += 1
+            tick = self.current
+            if tick & ((1 << (self.slot_bits * self.levels)) - 1) == 0:
+                self._cascade(self.overflow)
+            for level in range(self.levels - 1, 0, -1):
+                if tick & ((1 << (self.slot_bits * level)) - 1) == 0:
+                    self._cascade(self.wheels[level][(tick >> (self.slot_bits * level)) & self.mask])
+
+            bucket = self.wheels[0][tick & self.mask]
+            if bucket:
+                due = list(bucket)
+                bucket.clear()
+                self.count -= len(due)
+                for handle in due:
+                    handle.bucket = None
+                    handle.callback(*handle.args)
+                fired += len(due)
+            if self.count == 0:
+                self.current = target
+        return fired
@@ -0,0 +1,46 @@
+from PyQt5.QtCore import QObject, QTimer
+
+TICK_INTERVAL_MS = 200  # Label refresh rate; deadlines themselves do not depend on it
+
+
+class UiTicker(QObject):
+    """One shared timer that refreshes every on-screen countdown.
+
+    Callbacks subscribe while they have something to show and unsubscribe
+    afterwards; the timer only runs while there is at least one subscriber.
+    """
+
+    def __init__(self, interval=TICK_INTERVAL_MS):
+        super().__init__()
+        self._callbacks = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._tick)
+
+    def subscribe(self, callback):
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def unsubscribe(self, callback):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+        if not self._callbacks:
+            self._timer.stop()
+
+    def _tick(self):
+        # Iterate over a copy: callbacks may unsubscribe themselves
+        for callback in list(self._callbacks):
+            callback()
+
+
+_shared_ticker = None
+
+
+def shared_ticker():
+    """Return the process-wide ticker, creating it on first use."""
+    global _shared_ticker
+    if _shared_ticker is None:
+        _shared_ticker = UiTicker()
+    return _shared_ticker
@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import tempfile
+
+USER_DATA_FILE = "users.json"
+USER_DB_FILE = "users.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SqliteUserStore:
+    """User accounts in SQLite (WAL mode): indexed lookups and atomic inserts.
+
+    WAL lets several kiosks read while one of them signs a user up, and the
+    primary key makes "check the name is free, then insert" a single atomic
+    statement instead of a read-modify-write of the whole file.
+    """
+
+    def __init__(self, path=USER_DB_FILE, legacy_file=USER_DATA_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=10)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        if legacy_file and os.path.exists(legacy_file) and len(self) == 0:
+            self.import_users(JsonUserStore(legacy_file).load())
+
+    def get(self, username):
+        """Return the stored password hash for a user, or None."""
+        row = self.connection.execute(
+            "SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, username, password_hash):
+        """Insert a new user; return False if the name is already taken."""
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update(self, username, password_hash):
+        """Replace the stored hash of an existing user."""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE users SET password_hash = ? WHERE username = ?", (password_hash, username))
+
+    def import_users(self, users):
+        """Copy a `username -> hash` mapping into the store, keeping existing users."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)", users.items())
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+class JsonUserStore:
+    """The original users.json format, behind the same interface.
+
+    Every operation reads the whole file, so this is only meant for small
+    installations and for migrating into SqliteUserStore.
+    """
+
+    def __init__(self, path=USER_DATA_FILE):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            # An empty or truncated file holds no usable accounts
+            return {}
+
+    def save(self, users):
+        # Write to a temporary file and rename so readers never see half a file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as file:
+            json.dump(users, file)
+        os.replace(file.name, self.path)
+
+    def get(self, username):
+        return self.load().get(username)
+
+    def add(self, username, password_hash):
+        users = self.load()
+        if username in users:
+            return False
+        users[username] = password_hash
+        self.save(users)
+        return True
+
+    def update(self, username, password_hash):
+        users = self.load()
+        users[username] = password_hash
+        self.save(users)
+
+    def __contains__(self, username):
+        return username in self.load()
+
+    def __len__(self):
+        return len(self.load())
+
+    def close(self):
+        pass
+
+
+def open_user_store(path=USER_DB_FILE):
+    """Open the user store for `path`, choosing the backend by file extension."""
+    if path.endswith(".json"):
+        return JsonUserStore(path)
+    return SqliteUserStore(path)